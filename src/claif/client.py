@@ -1,7 +1,10 @@
 # this_file: claif/src/claif/client.py
 """Unified Claif client with OpenAI Responses API compatibility."""
 
+import functools
+import importlib
 import os
+import sys
 from collections.abc import Iterator
 from typing import Any, Literal
 
@@ -12,6 +15,25 @@ from openai.types.chat import (
     ChatCompletionMessageParam,
 )
 
+# Environment probes for provider auto-detection, in priority order.
+# Precomputed once at import so each construction iterates a tuple instead
+# of re-building an if-chain of os.getenv calls. Names are interned so the
+# downstream equality tests and dict lookups short-circuit on identity.
+_PROVIDER_ENV: tuple[tuple[str, tuple[str, ...]], ...] = (
+    (sys.intern("claude"), (sys.intern("ANTHROPIC_API_KEY"),)),
+    (sys.intern("gemini"), (sys.intern("GEMINI_API_KEY"), sys.intern("GOOGLE_API_KEY"))),
+)
+
+# Provider client classes by module/attribute; imported lazily so that
+# constructing a client for one provider never pays another provider's
+# SDK import cost.
+_PROVIDER_CLIENTS: dict[str, tuple[str, str]] = {
+    "claude": ("claif_cla.client", "ClaudeClient"),
+    "gemini": ("claif_gem.client", "GeminiClient"),
+    "codex": ("claif_cod.client", "CodexClient"),
+    "lms": ("claif_lms.client", "LMSClient"),
+}
+
 
 class ClaifClient:
     """Unified client for all Claif providers with OpenAI-compatible API."""
@@ -33,45 +55,43 @@ class ClaifClient:
         self._client = None
         self._kwargs = kwargs
 
-        # Initialize the appropriate provider client
-        if self.provider == "claude":
-            from claif_cla.client import ClaudeClient
-
-            self._client = ClaudeClient(api_key=api_key, **kwargs)
-        elif self.provider == "gemini":
-            from claif_gem.client import GeminiClient
-
-            self._client = GeminiClient(api_key=api_key, **kwargs)
-        elif self.provider == "codex":
-            from claif_cod.client import CodexClient
-
-            self._client = CodexClient(**kwargs)  # Codex doesn't use API key
-        elif self.provider == "lms":
-            from claif_lms.client import LMSClient
-
-            self._client = LMSClient(api_key=api_key, **kwargs)
-        else:
+        # Initialize the appropriate provider client, importing only its module
+        try:
+            module_name, class_name = _PROVIDER_CLIENTS[self.provider]
+        except KeyError:
             msg = f"Unknown provider: {self.provider}"
-            raise ValueError(msg)
+            raise ValueError(msg) from None
+        client_cls = getattr(importlib.import_module(module_name), class_name)
+        if self.provider == "codex":
+            self._client = client_cls(**kwargs)  # Codex doesn't use API key
+        else:
+            self._client = client_cls(api_key=api_key, **kwargs)
 
         # Create a namespace-like structure to match OpenAI client
         self.chat = self._ChatNamespace(self)
 
     def _detect_provider(self) -> str:
         """Auto-detect provider based on environment variables."""
-        if os.getenv("ANTHROPIC_API_KEY"):
-            return "claude"
-        if os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"):
-            return "gemini"
-        if os.getenv("OPENAI_API_KEY") and os.getenv("OPENAI_BASE_URL", "").endswith("v1"):
+        environ = os.environ
+        for provider, env_vars in _PROVIDER_ENV:
+            if any(environ.get(var) for var in env_vars):
+                return provider
+        if environ.get("OPENAI_API_KEY") and environ.get("OPENAI_BASE_URL", "").endswith("v1"):
             return "lms"  # LM Studio uses OpenAI-compatible endpoints
-        if os.getenv("CODEX_CLI_PATH") or self._is_codex_available():
+        if environ.get("CODEX_CLI_PATH") or self._is_codex_available():
             return "codex"
         # Default to LMS as it's most flexible
         return "lms"
 
-    def _is_codex_available(self) -> bool:
-        """Check if Codex CLI is available."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _is_codex_available() -> bool:
+        """Check if the Codex CLI is on PATH.
+
+        Memoized: shutil.which walks the whole PATH, and its answer does
+        not change within a process. Tests patching shutil.which call
+        ClaifClient._is_codex_available.cache_clear() first.
+        """
         import shutil
 
         return shutil.which("codex") is not None
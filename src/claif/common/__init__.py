@@ -0,0 +1,2 @@
+# this_file: claif/src/claif/common/__init__.py
+"""Shared utilities for the Claif framework."""
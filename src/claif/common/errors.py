@@ -0,0 +1,46 @@
+# this_file: claif/src/claif/common/errors.py
+"""Provider-agnostic error types for the Claif framework."""
+
+from typing import Any
+
+
+class ClaifError(Exception):
+    """Base exception for all Claif errors.
+
+    Carries a human-readable message plus a details dict for structured
+    context (status codes, field names, ...) that callers can inspect
+    without parsing the message.
+    """
+
+    def __init__(self, message: str, details: dict[str, Any] | None = None) -> None:
+        self.message = message
+        self.details = details or {}
+        super().__init__(self.message)
+
+
+class ProviderError(ClaifError):
+    """Error raised by a specific provider, prefixed with its name."""
+
+    def __init__(self, provider: str, message: str, details: dict[str, Any] | None = None) -> None:
+        self.provider = provider
+        super().__init__(f"{provider}: {message}", details)
+
+
+class ConfigurationError(ClaifError):
+    """Raised when configuration is missing or invalid."""
+
+
+class SessionError(ClaifError):
+    """Raised when session management fails."""
+
+
+class TransportError(ClaifError):
+    """Raised when communication with a provider backend fails."""
+
+
+class ClaifTimeoutError(ClaifError):
+    """Raised when an operation exceeds its time budget."""
+
+
+class ValidationError(ClaifError):
+    """Raised when user input fails validation."""
@@ -0,0 +1,337 @@
+# this_file: claif/src/claif/common/install.py
+"""Cross-platform helpers for installing Claif provider tools."""
+
+import functools
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+
+class InstallError(Exception):
+    """Raised when a provider or tool installation step fails."""
+
+
+# Resolved executable paths, keyed by name. shutil.which walks PATH and
+# stats every candidate on each call; like a shell's `hash` builtin, we
+# remember the answer for the lifetime of the process.
+_which_cache: dict[str, Path | None] = {}
+
+# Resolved bun binary, cached once ensure_bun_installed has seen it
+_bun_path: Path | None = None
+
+# Directory listings keyed by directory, holding (mtime_ns, names). One
+# listdir per directory beats one stat per candidate file, and the mtime
+# key invalidates the entry automatically when the directory changes.
+_dir_listing_cache: dict[Path, tuple[int, frozenset[str]]] = {}
+
+
+def invalidate_executable_cache() -> None:
+    """Drop all cached executable lookups.
+
+    Called after installs/uninstalls, which can change what is on PATH.
+    """
+    global _bun_path
+    _which_cache.clear()
+    _dir_listing_cache.clear()
+    _candidate_dirs.cache_clear()
+    _bun_path = None
+
+
+@functools.lru_cache(maxsize=1)
+def _candidate_dirs() -> tuple[Path, ...]:
+    """Build the deduplicated tuple of Claif install locations once.
+
+    Each entry costs a handful of Path allocations; the set never changes
+    within a process, so pay for it on the first PATH miss only.
+    """
+    home = _home()
+    dirs: list[Path] = []
+    for directory in (get_install_dir(), home / ".local" / "bin", home / ".bun" / "bin"):
+        if directory not in dirs:
+            dirs.append(directory)
+    return tuple(dirs)
+
+
+def _dir_entries(directory: Path) -> frozenset[str]:
+    """List a directory's file names, cached until its mtime changes.
+
+    os.scandir exposes the dirent type without a stat per entry, so the
+    file-only filter is effectively free on the initial enumeration.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return frozenset()
+    cached = _dir_listing_cache.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with os.scandir(directory) as it:
+            names = frozenset(entry.name for entry in it if entry.is_file())
+    except OSError:
+        names = frozenset()
+    _dir_listing_cache[directory] = (mtime_ns, names)
+    return names
+
+
+def _home() -> Path:
+    """Resolve the user's home directory.
+
+    $HOME is a plain dict lookup and is what tests patch, so it is read
+    fresh every time; only the pwd.getpwuid fallback behind Path.home()
+    is worth caching.
+    """
+    home = os.environ.get("HOME")
+    if home:
+        return Path(home)
+    return _home_fallback()
+
+
+@functools.lru_cache(maxsize=1)
+def _home_fallback() -> Path:
+    """Cache the pwd-based home lookup for processes without $HOME."""
+    return Path.home()
+
+
+@functools.lru_cache(maxsize=1)
+def get_install_dir() -> Path:
+    """Get the platform-specific directory for Claif-managed executables.
+
+    Uses sys.platform rather than platform.system(): the latter can shell
+    out to uname() while sys.platform is a plain interned string. The
+    result is memoized — neither LOCALAPPDATA nor HOME changes within a
+    process lifetime; tests that patch them call get_install_dir.cache_clear().
+    """
+    if sys.platform == "win32":
+        local_app_data = os.environ.get("LOCALAPPDATA", str(_home() / "AppData" / "Local"))
+        return Path(local_app_data) / "Programs" / "claif"
+    return _home() / ".local" / "bin"
+
+
+def ensure_install_dir() -> Path:
+    """Ensure the install directory exists and return it."""
+    install_dir = get_install_dir()
+    # exist_ok swallows EEXIST in C: one mkdir syscall instead of stat+mkdir
+    install_dir.mkdir(parents=True, exist_ok=True)
+    return install_dir
+
+
+def check_bun_available() -> bool:
+    """Check if the bun runtime is available on PATH."""
+    return find_executable("bun") is not None
+
+
+def ensure_bun_installed() -> bool:
+    """Ensure bun is installed, running its installer if necessary."""
+    global _bun_path
+    if _bun_path is not None:
+        return True
+
+    # os.path.isfile is a single stat; no PATH walk, no subprocess
+    bun_path = _home() / ".bun" / "bin" / "bun"
+    if os.path.isfile(bun_path):
+        _bun_path = bun_path
+        return True
+
+    logger.debug("bun not found, running installer")
+    if platform.system() == "Windows":
+        command = ['powershell -c "irm bun.sh/install.ps1 | iex"']
+    else:
+        command = ["curl -fsSL https://bun.sh/install | bash"]
+    result = subprocess.run(command, shell=True, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        return False
+    _bun_path = bun_path
+    return True
+
+
+def _wanted_names(name: str) -> list[str]:
+    """Expand an executable name with PATHEXT variants on Windows.
+
+    Names are casefolded for comparison: PATHEXT defaults to uppercase
+    (.COM;.EXE;...) while on-disk names are typically lowercase. A name
+    that already carries a PATHEXT suffix is kept as-is; bare names
+    without an extension are not executable on Windows, so no bare
+    variant is emitted.
+    """
+    if sys.platform == "win32":
+        pathext = [ext.casefold() for ext in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep) if ext]
+        folded = name.casefold()
+        if any(folded.endswith(ext) for ext in pathext):
+            return [folded]
+        return [folded + ext for ext in pathext]
+    return [name]
+
+
+def _scan_dirs_for(name: str, directories: tuple[Path, ...]) -> Path | None:
+    """Look for name in directories using cached listings.
+
+    All PATHEXT variants test against one cached listing set per
+    directory instead of stat'ing each name+extension combination. On
+    Windows the comparison is case-insensitive and the returned path
+    keeps the on-disk spelling.
+    """
+    wanted = _wanted_names(name)
+    casefold = sys.platform == "win32"
+    for directory in directories:
+        entries = _dir_entries(directory)
+        if casefold:
+            by_folded_name = {entry.casefold(): entry for entry in entries}
+            for candidate in wanted:
+                match = by_folded_name.get(candidate)
+                if match is not None:
+                    return directory / match
+        else:
+            for candidate in wanted:
+                if candidate in entries:
+                    return directory / candidate
+    return None
+
+
+def find_executable(name: str) -> Path | None:
+    """Find an executable on PATH or in known Claif install locations."""
+    if name in _which_cache:
+        return _which_cache[name]
+
+    if sys.platform == "win32":
+        # shutil.which stats every PATHEXT combination in every PATH dir;
+        # scanning the cached listings does one enumeration per directory
+        path_dirs = tuple(Path(entry) for entry in os.environ.get("PATH", "").split(os.pathsep) if entry)
+        result = _scan_dirs_for(name, path_dirs)
+    else:
+        which_result = shutil.which(name)
+        result = Path(which_result) if which_result else None
+    if result is None:
+        result = _scan_dirs_for(name, _candidate_dirs())
+    _which_cache[name] = result
+    return result
+
+
+def _decode_stderr(error: subprocess.CalledProcessError) -> str:
+    """Render a CalledProcessError's captured stderr as text."""
+    stderr = error.stderr
+    if isinstance(stderr, bytes):
+        return stderr.decode(errors="replace")
+    return stderr or ""
+
+
+def _bun_argv0() -> str:
+    """Get the bun binary as a ready-to-exec string, reusing the cached path."""
+    bun_path = _bun_path if _bun_path is not None else _home() / ".bun" / "bin" / "bun"
+    return str(bun_path)
+
+
+def run_bun_install(*packages: str) -> None:
+    """Install one or more packages globally with bun."""
+    result = subprocess.run([_bun_argv0(), "add", "-g", *packages], capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        msg = f"Failed to install {', '.join(packages)} with bun: {result.stderr}"
+        raise InstallError(msg)
+
+
+def _run_install_command(command: list[str], names: list[str]) -> None:
+    """Run an install subprocess, translating failure into InstallError.
+
+    check=True raises at the C level instead of a Python returncode test,
+    and stdout=DEVNULL skips pipe buffering for output we never read.
+    """
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except subprocess.CalledProcessError as e:
+        msg = f"Failed to install {', '.join(names)}: {_decode_stderr(e)}"
+        raise InstallError(msg) from e
+
+
+def _install_via_pip(names: list[str]) -> None:
+    """Install packages in one pip subprocess."""
+    _run_install_command([sys.executable, "-m", "pip", "install", *names], names)
+
+
+def _install_via_pipx(names: list[str]) -> None:
+    """Install packages in one pipx subprocess."""
+    _run_install_command(["pipx", "install", *names], names)
+
+
+def _install_via_bun(names: list[str]) -> None:
+    """Install packages globally with bun, bootstrapping it if needed."""
+    if not ensure_bun_installed():
+        msg = f"bun is required to install {', '.join(names)} but could not be installed"
+        raise InstallError(msg)
+    run_bun_install(*names)
+
+
+# Method dispatch as data: one dict lookup per call instead of an
+# if/elif compare chain, and new package managers are a one-line addition
+_INSTALL_METHODS = {
+    "pip": _install_via_pip,
+    "pipx": _install_via_pipx,
+    "bun": _install_via_bun,
+}
+
+
+def install_providers(names: list[str], method: str = "pip") -> None:
+    """Install several provider packages with a single subprocess.
+
+    Process startup and dependency-resolver initialization dominate small
+    installs, so one `pip install pkg1 pkg2 ...` beats one subprocess per
+    package.
+
+    Args:
+        names: Package names to install.
+        method: Install method - "pip", "pipx" or "bun".
+
+    Raises:
+        InstallError: If the method is unsupported or installation fails.
+    """
+    if not names:
+        return
+    handler = _INSTALL_METHODS.get(method)
+    if handler is None:
+        msg = f"Unsupported install method: {method}"
+        raise InstallError(msg)
+    handler(names)
+    invalidate_executable_cache()
+    logger.debug(f"Installed {', '.join(names)} via {method}")
+
+
+def install_provider(name: str, method: str = "pip") -> None:
+    """Install a single provider package; thin wrapper over install_providers."""
+    install_providers([name], method=method)
+
+
+# Uninstall argv builders keyed by method, mirroring _INSTALL_METHODS
+_UNINSTALL_ARGV = {
+    "pip": lambda name: [sys.executable, "-m", "pip", "uninstall", "-y", name],
+    "pipx": lambda name: ["pipx", "uninstall", name],
+    "bun": lambda name: [_bun_argv0(), "remove", "-g", name],
+}
+
+
+def uninstall_provider(name: str, method: str = "pip") -> None:
+    """Uninstall a provider package.
+
+    Args:
+        name: Package name to uninstall.
+        method: Install method the package was installed with.
+
+    Raises:
+        InstallError: If the method is unsupported or uninstallation fails.
+    """
+    argv_builder = _UNINSTALL_ARGV.get(method)
+    if argv_builder is None:
+        msg = f"Unsupported install method: {method}"
+        raise InstallError(msg)
+    command = argv_builder(name)
+
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except subprocess.CalledProcessError as e:
+        msg = f"Failed to uninstall {name}: {_decode_stderr(e)}"
+        raise InstallError(msg) from e
+    invalidate_executable_cache()
+    logger.debug(f"Uninstalled {name} via {method}")
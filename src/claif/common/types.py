@@ -0,0 +1,124 @@
+# this_file: claif/src/claif/common/types.py
+"""Core message and option types shared across Claif providers."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    from enum import StrEnum
+except ImportError:  # Python 3.10: enum.StrEnum landed in 3.11
+    from enum import Enum
+
+    class StrEnum(str, Enum):  # type: ignore[no-redef]
+        """Minimal StrEnum stand-in: members are interned str instances
+        whose str() is the member value, matching 3.11 semantics."""
+
+        def __str__(self) -> str:
+            return str(self.value)
+
+
+class Provider(StrEnum):
+    """Providers the Claif framework can route queries to."""
+
+    CLAUDE = "claude"
+    GEMINI = "gemini"
+    CODEX = "codex"
+
+
+class MessageRole(StrEnum):
+    """Role of a conversation participant."""
+
+    USER = "user"
+    ASSISTANT = "assistant"
+    SYSTEM = "system"
+    RESULT = "result"
+
+
+@dataclass(slots=True)
+class TextBlock:
+    """Plain text content block."""
+
+    type: str = "text"
+    text: str = ""
+
+
+@dataclass(slots=True)
+class ToolUseBlock:
+    """Tool invocation content block."""
+
+    type: str = "tool_use"
+    id: str = ""
+    name: str = ""
+    input: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ToolResultBlock:
+    """Tool result content block."""
+
+    type: str = "tool_result"
+    tool_use_id: str = ""
+    content: list[TextBlock] = field(default_factory=list)
+    is_error: bool = False
+
+
+ContentBlock = TextBlock | ToolUseBlock | ToolResultBlock
+
+
+@dataclass(slots=True)
+class Message:
+    """A single conversation message.
+
+    String content is normalized to a single-TextBlock list so consumers
+    can always iterate blocks.
+    """
+
+    role: MessageRole
+    content: str | list[ContentBlock]
+
+    def __post_init__(self) -> None:
+        # Exact-class check: content is either a plain str or a block list,
+        # and this runs once per message on the streaming path.
+        if self.content.__class__ is str:
+            self.content = [TextBlock(text=self.content)]
+
+
+@dataclass
+class ClaifOptions:
+    """Common options accepted by every provider."""
+
+    provider: Provider | None = None
+    model: str | None = None
+    temperature: float | None = None
+    max_tokens: int | None = None
+    system_prompt: str | None = None
+    timeout: int | None = None
+    verbose: bool = False
+    output_format: str = "text"
+    config_file: str | None = None
+    session_id: str | None = None
+    cache: bool = False
+    retry_count: int = 3
+    retry_delay: float = 1.0
+
+
+@dataclass(slots=True)
+class ResponseMetrics:
+    """Timing and usage metrics attached to a response."""
+
+    duration: float = 0.0
+    tokens_used: int = 0
+    cost: float = 0.0
+    provider: Provider | None = None
+    model: str | None = None
+    cached: bool = False
+
+
+@dataclass
+class ClaifResponse:
+    """Aggregated response from a provider query."""
+
+    messages: list[Message]
+    metrics: ResponseMetrics | None = None
+    session_id: str | None = None
+    error: str | None = None
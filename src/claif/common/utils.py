@@ -0,0 +1,193 @@
+# this_file: claif/src/claif/common/utils.py
+"""Formatting, path and terminal helpers shared across Claif providers."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import platformdirs
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+from claif.common.types import Message, ResponseMetrics, TextBlock, ToolResultBlock, ToolUseBlock
+
+APP_NAME = "com.twardoch.claif"
+
+
+def format_response(message: Message, format: str = "text") -> str:
+    """Format a message for display in the requested output format."""
+    if format == "json":
+        return json.dumps(message_to_dict(message), indent=2)
+    content = message.content
+    if isinstance(content, str):
+        text = content
+    else:
+        text = "\n".join(block.text for block in content if isinstance(block, TextBlock))
+    if format == "markdown":
+        console = Console()
+        with console.capture() as capture:
+            console.print(Markdown(text))
+        return capture.get()
+    return text
+
+
+def message_to_dict(message: Message) -> dict[str, Any]:
+    """Convert a Message into a JSON-serializable dict."""
+    content = message.content
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = [block_to_dict(block) for block in content]
+    return {"role": message.role.value, "content": blocks}
+
+
+def block_to_dict(block: Any) -> dict[str, Any]:
+    """Convert a content block into a JSON-serializable dict."""
+    if isinstance(block, TextBlock):
+        return {"type": block.type, "text": block.text}
+    if isinstance(block, ToolUseBlock):
+        return {"type": block.type, "id": block.id, "name": block.name, "input": block.input}
+    if isinstance(block, ToolResultBlock):
+        return {
+            "type": block.type,
+            "tool_use_id": block.tool_use_id,
+            "content": [block_to_dict(inner) for inner in block.content],
+            "is_error": block.is_error,
+        }
+    return dict(vars(block))
+
+
+def format_metrics(metrics: ResponseMetrics) -> str:
+    """Format response metrics for display."""
+    lines = [
+        f"Duration: {metrics.duration:.2f}s",
+        f"Tokens: {metrics.tokens_used}",
+        f"Cost: ${metrics.cost:.4f}",
+        f"Cached: {'Yes' if metrics.cached else 'No'}",
+    ]
+    if metrics.provider is not None:
+        lines.append(f"Provider: {metrics.provider.value}")
+    if metrics.model is not None:
+        lines.append(f"Model: {metrics.model}")
+    return "\n".join(lines)
+
+
+def ensure_directory(path: Path) -> None:
+    """Create a directory (and parents) if it does not already exist."""
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def get_claif_data_dir() -> Path:
+    """Return the per-user Claif data directory."""
+    return Path(platformdirs.user_data_dir(APP_NAME, "claif"))
+
+
+def get_claif_bin_path() -> Path:
+    """Return the directory where Claif installs provider binaries."""
+    return get_claif_data_dir() / "bin"
+
+
+def get_install_location() -> Path:
+    """Return the platform-specific install location for bundled tools."""
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA", "")) / "claif" / "bin"
+    return Path.home() / ".local" / "bin" / "claif"
+
+
+def inject_claif_bin_to_path() -> dict[str, str]:
+    """Return a copy of the environment with the Claif bin dir prepended to PATH."""
+    env = dict(os.environ)
+    install_location = str(get_install_location())
+    env["PATH"] = f"{install_location}{os.pathsep}{env.get('PATH', '')}"
+    return env
+
+
+def timestamp() -> str:
+    """Return a filesystem-friendly timestamp string."""
+    return time.strftime("%Y%m%d_%H%M%S")
+
+
+def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
+    """Truncate text to max_length, appending suffix when shortened."""
+    if len(text) <= max_length:
+        return text
+    return text[: max_length - len(suffix)] + suffix
+
+
+def parse_content_blocks(content: Any) -> list[TextBlock]:
+    """Normalize arbitrary content into a list of TextBlocks."""
+    if isinstance(content, str):
+        return [TextBlock(text=content)]
+    if isinstance(content, list):
+        blocks = []
+        for item in content:
+            if isinstance(item, TextBlock):
+                blocks.append(item)
+            elif isinstance(item, dict):
+                blocks.append(TextBlock(text=item.get("text", "")))
+            else:
+                blocks.append(TextBlock(text=str(item)))
+        return blocks
+    return [TextBlock(text=str(content))]
+
+
+def create_progress_bar(description: str) -> Progress:
+    """Create a rich progress bar preconfigured for Claif operations."""
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TimeElapsedColumn(),
+    )
+    progress.add_task(description, total=None)
+    return progress
+
+
+def open_commands_in_terminals(commands: list[str]) -> None:
+    """Open each command in a new terminal window.
+
+    Raise NotImplementedError on platforms without a known terminal
+    launcher.
+    """
+    system = platform.system()
+    if system == "Darwin":
+        for command in commands:
+            script = f'tell application "Terminal" to do script "{command}"'
+            subprocess.Popen(["osascript", "-e", script])
+    elif system == "Windows":
+        for command in commands:
+            subprocess.Popen(["cmd", "/c", "start", "cmd", "/k", command])
+    elif system == "Linux":
+        for command in commands:
+            for terminal in ("gnome-terminal", "konsole", "xterm"):
+                try:
+                    if terminal == "gnome-terminal":
+                        subprocess.Popen([terminal, "--", "bash", "-c", f"{command}; exec bash"])
+                    else:
+                        subprocess.Popen([terminal, "-e", f"bash -c '{command}; exec bash'"])
+                    break
+                except FileNotFoundError:
+                    continue
+    else:
+        msg = f"Opening terminals is not supported on {system}"
+        raise NotImplementedError(msg)
+
+
+def prompt_tool_configuration(tool_name: str, commands: list[str]) -> None:
+    """Offer to open configuration commands for a tool in new terminals."""
+    print(f"{tool_name} needs configuration. The following commands will help:")
+    for command in commands:
+        print(f"  {command}")
+    try:
+        answer = input("Open these commands in new terminals? [y/N] ")
+    except (KeyboardInterrupt, EOFError):
+        print()
+        return
+    if answer.strip().lower() in ("y", "yes"):
+        open_commands_in_terminals(commands)
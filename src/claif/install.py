@@ -0,0 +1,54 @@
+# this_file: claif/src/claif/install.py
+"""Top-level installation orchestration for Claif provider tools."""
+
+import concurrent.futures
+
+from loguru import logger
+
+from claif.common.install import InstallError, get_install_dir, install_providers, uninstall_provider
+
+# Provider packages managed by the install helpers
+PROVIDER_PACKAGES = ["claif_cla", "claif_gem", "claif_cod"]
+
+# Parallel subprocess fan-out is network/disk bound; a few workers suffice
+_MAX_WORKERS = 4
+
+
+def get_install_location() -> str:
+    """Get the directory where Claif tools are installed, as a string."""
+    return str(get_install_dir())
+
+
+def install_all_tools(method: str = "pip") -> dict[str, bool]:
+    """Install all known provider packages in one batched subprocess.
+
+    Returns a mapping of package name to install success.
+    """
+    try:
+        install_providers(PROVIDER_PACKAGES, method=method)
+    except InstallError as e:
+        logger.warning(f"Failed to install provider packages: {e}")
+        return {package: False for package in PROVIDER_PACKAGES}
+    return {package: True for package in PROVIDER_PACKAGES}
+
+
+def uninstall_all_tools(method: str = "pip") -> dict[str, bool]:
+    """Uninstall all known provider packages, fanning out across threads.
+
+    Each removal is its own subprocess and largely I/O-bound, so the
+    sequential loop becomes an embarrassingly parallel thread-pool fan-out.
+    Returns a mapping of package name to uninstall success.
+    """
+    results = {}
+    max_workers = min(_MAX_WORKERS, len(PROVIDER_PACKAGES))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(uninstall_provider, package, method): package for package in PROVIDER_PACKAGES}
+        for future in concurrent.futures.as_completed(futures):
+            package = futures[future]
+            try:
+                future.result()
+                results[package] = True
+            except InstallError as e:
+                logger.warning(f"Failed to uninstall {package}: {e}")
+                results[package] = False
+    return results
@@ -0,0 +1,308 @@
+# this_file: claif/src/claif/server.py
+"""FastMCP server exposing Claif queries as MCP tools."""
+
+import asyncio
+import functools
+import importlib.util
+import random
+import sys
+import time
+from collections.abc import AsyncIterator
+from dataclasses import replace
+
+import fire
+import uvicorn
+from fastmcp import FastMCP
+from loguru import logger
+from pydantic import BaseModel
+
+from claif.client import ClaifClient
+from claif.common.types import ClaifOptions, Message, MessageRole, Provider
+
+# FastMCP owns the wire encoding for tool results; response models are
+# pydantic v2, whose Rust-backed pydantic-core serializer is already in
+# orjson's performance class, so no separate JSON encoder is plugged in.
+mcp = FastMCP("Claif")
+
+# Recent healthy probe results, keyed by provider: (monotonic timestamp, True).
+# Only healthy outcomes are cached so a provider that was down is re-probed
+# on the next call instead of being reported down for a full TTL window.
+_health_cache: dict[Provider, tuple[float, bool]] = {}
+_HEALTH_CACHE_TTL = 60.0
+
+# Valid provider names for O(1) request validation without enum construction
+_VALID_PROVIDERS = frozenset(p.value for p in Provider)
+
+# Numeric logging levels mapped to uvicorn's log-level names
+_LEVEL_NAMES = {10: "debug", 20: "info", 30: "warning", 40: "error", 50: "critical"}
+
+# Default model advertised per provider in listings
+_DEFAULT_MODELS: dict[Provider, str] = {
+    Provider.CLAUDE: "claude-3-opus",
+    Provider.GEMINI: "gemini-pro",
+    Provider.CODEX: "o4-mini",
+}
+
+
+class QueryRequest(BaseModel):
+    """Request payload accepted by the query tools."""
+
+    prompt: str
+    provider: str | None = None
+    model: str | None = None
+    temperature: float | None = None
+    max_tokens: int | None = None
+    cache: bool = True
+
+
+class QueryResponse(BaseModel):
+    """Response payload produced by the query tools."""
+
+    messages: list[dict]
+    provider: str | None = None
+    model: str | None = None
+    error: str | None = None
+
+
+class ProviderInfo(BaseModel):
+    """Description of an available provider."""
+
+    name: str
+    enabled: bool = True
+    default_model: str | None = None
+
+
+# The provider roster is static; build it once so listing calls return a
+# copy of this list instead of constructing fresh pydantic models. With
+# the roster prebuilt, no ProviderInfo is constructed per call, so there
+# is nothing left for a NamedTuple swap to save — and ProviderInfo must
+# stay a BaseModel so it serializes as a JSON object (a NamedTuple would
+# go out on the wire as an array and change the tool's schema).
+_PROVIDER_INFOS = [
+    ProviderInfo.model_construct(name=p.value, enabled=True, default_model=_DEFAULT_MODELS[p]) for p in Provider
+]
+
+
+async def query(prompt: str, options: ClaifOptions) -> AsyncIterator[Message]:
+    """Query one provider, yielding its response messages.
+
+    Bridges the synchronous ClaifClient to the async MCP tools by running
+    the blocking completion call in a worker thread.
+    """
+    provider = options.provider or Provider.CLAUDE
+
+    def _run():
+        client = ClaifClient(provider=provider.value)
+        return client.chat.completions.create(
+            model=options.model or _DEFAULT_MODELS[provider],
+            messages=[{"role": "user", "content": prompt}],
+            temperature=options.temperature,
+            max_tokens=options.max_tokens,
+        )
+
+    completion = await asyncio.to_thread(_run)
+    yield Message(role=MessageRole.ASSISTANT, content=completion.choices[0].message.content)
+
+
+async def query_random(prompt: str, options: ClaifOptions) -> AsyncIterator[Message]:
+    """Query one randomly selected provider, recording it on options."""
+    options.provider = random.choice(list(Provider))
+    async for message in query(prompt, options):
+        yield message
+
+
+async def query_all(prompt: str, options: ClaifOptions) -> AsyncIterator[dict[Provider, list[Message]]]:
+    """Query every provider concurrently, yielding one mapping."""
+    providers = list(Provider)
+
+    async def _collect(provider: Provider) -> list[Message]:
+        messages = []
+        async for message in query(prompt, replace(options, provider=provider)):
+            messages.append(message)
+        return messages
+
+    gathered = await asyncio.gather(*(_collect(p) for p in providers))
+    yield dict(zip(providers, gathered, strict=True))
+
+
+def _serialize_message(message: Message) -> dict:
+    """Convert a Message into a plain role/content dict for the wire.
+
+    Hand-rolled for the two-field wire schema: a generic model dump
+    walks every field descriptor, while this is one join and one dict
+    display per message.
+    """
+    content = message.content
+    if content.__class__ is not str:
+        content = "".join(block.text for block in content if block.type == "text")
+    return {"role": message.role.value, "content": content}
+
+
+@functools.lru_cache(maxsize=256)
+def _options_for(
+    provider: Provider | None,
+    model: str | None,
+    temperature: float | None,
+    max_tokens: int | None,
+    cache: bool,
+) -> ClaifOptions:
+    """Build (and memoize) ClaifOptions for one request shape.
+
+    Requests overwhelmingly repeat the same handful of shapes, so the
+    common case becomes a cache hit instead of a fresh allocation. The
+    returned instance is shared: callers that mutate options must take
+    a dataclasses.replace copy first.
+    """
+    return ClaifOptions(provider=provider, model=model, temperature=temperature, max_tokens=max_tokens, cache=cache)
+
+
+def _options_from_request(request: QueryRequest, provider: Provider | None = None) -> ClaifOptions:
+    """Build ClaifOptions from a QueryRequest."""
+    return _options_for(provider, request.model, request.temperature, request.max_tokens, request.cache)
+
+
+async def claif_query(request: QueryRequest) -> QueryResponse:
+    """Query a specific provider (or the default) and collect its messages."""
+    # Validate synchronously so a bad provider name returns before any
+    # async generator or task is ever constructed.
+    if request.provider and request.provider not in _VALID_PROVIDERS:
+        error = f"Unknown provider: {request.provider}"
+        return QueryResponse.model_construct(messages=[], provider=request.provider, error=error)
+
+    provider = Provider(request.provider) if request.provider else None
+    messages = []
+    try:
+        options = _options_from_request(request, provider)
+        async for message in query(request.prompt, options):
+            messages.append(_serialize_message(message))
+    except Exception as e:
+        return QueryResponse.model_construct(messages=[], provider=request.provider, error=str(e))
+    return QueryResponse.model_construct(messages=messages, provider=request.provider, model=request.model)
+
+
+async def claif_query_random(request: QueryRequest) -> QueryResponse:
+    """Query one randomly selected provider."""
+    # Private copy: query_random records the chosen provider on options,
+    # and the memoized instance must stay pristine.
+    options = replace(_options_from_request(request))
+    messages = []
+    try:
+        async for message in query_random(request.prompt, options):
+            messages.append(_serialize_message(message))
+    except Exception as e:
+        return QueryResponse.model_construct(messages=[], error=str(e))
+    provider = options.provider.value if options.provider else None
+    return QueryResponse.model_construct(messages=messages, provider=provider)
+
+
+async def claif_query_all(request: QueryRequest) -> dict[str, QueryResponse]:
+    """Query all providers concurrently and collect their responses by name.
+
+    One query task runs per provider under asyncio.gather, so wall-clock
+    time is the slowest provider rather than the sum, and one provider's
+    failure surfaces in its own response without losing the others.
+    """
+    options = _options_from_request(request)
+
+    async def _collect(provider: Provider) -> QueryResponse:
+        messages = []
+        async for message in query(request.prompt, replace(options, provider=provider)):
+            messages.append(_serialize_message(message))
+        return QueryResponse.model_construct(messages=messages, provider=provider.value)
+
+    providers = list(Provider)
+    results = await asyncio.gather(*(_collect(p) for p in providers), return_exceptions=True)
+    responses: dict[str, QueryResponse] = {}
+    for provider, result in zip(providers, results, strict=True):
+        if isinstance(result, BaseException):
+            response = QueryResponse.model_construct(messages=[], provider=provider.value, error=str(result))
+            responses[provider.value] = response
+        else:
+            responses[provider.value] = result
+    return responses
+
+
+async def claif_list_providers() -> list[ProviderInfo]:
+    """List the providers this server can route queries to."""
+    return list(_PROVIDER_INFOS)
+
+
+async def claif_health_check(provider: str | None = None) -> dict[str, bool]:
+    """Probe provider health with a minimal one-token query per provider.
+
+    Probes are network-bound and independent, so they all run concurrently
+    under asyncio.gather: total latency is the slowest provider, not the
+    sum of all of them. Healthy results are reused for a short TTL, so
+    orchestrators polling the health endpoint do not trigger a probe per
+    call; failures are never cached and always force a fresh probe.
+    """
+    providers = [Provider(provider)] if provider else list(Provider)
+    now = time.monotonic()
+
+    status: dict[str, bool] = {}
+    to_probe = []
+    for p in providers:
+        cached_at, healthy = _health_cache.get(p, (0.0, False))
+        if healthy and now - cached_at < _HEALTH_CACHE_TTL:
+            status[p.value] = True
+        else:
+            to_probe.append(p)
+
+    async def _probe(p: Provider) -> None:
+        # A probe must reflect current provider health: force-disable
+        # response caching and retries, and keep the timeout tight so a
+        # hung provider reads as down instead of stalling the endpoint.
+        options = ClaifOptions(provider=p, max_tokens=1, timeout=2, cache=False, retry_count=0)
+        async for _message in query("Hello", options):
+            break
+
+    results = await asyncio.gather(*(_probe(p) for p in to_probe), return_exceptions=True)
+    for p, result in zip(to_probe, results, strict=True):
+        healthy = not isinstance(result, Exception)
+        status[p.value] = healthy
+        if healthy:
+            _health_cache[p] = (now, True)
+    return {p.value: status[p.value] for p in providers}
+
+
+# Register the tools on the shared FastMCP app. Registering the plain
+# functions (rather than decorating) keeps them importable and directly
+# callable by tests and other modules.
+for _tool in (claif_query, claif_query_random, claif_query_all, claif_list_providers, claif_health_check):
+    mcp.tool(_tool)
+
+
+def _loop_implementation() -> str:
+    """Pick the uvicorn event-loop implementation for this platform.
+
+    uvloop's libuv scheduler handles the I/O-bound MCP workload far
+    better than the pure-Python asyncio loop, so use it whenever the
+    optional dependency is present (it has no Windows build).
+    """
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        return "uvloop"
+    return "asyncio"
+
+
+def start_mcp_server(
+    host: str = "localhost",
+    port: int = 8000,
+    reload: bool = False,
+    config=None,
+) -> None:
+    """Start the FastMCP server under uvicorn."""
+    level = getattr(logger, "level", 20)
+    if not isinstance(level, int):
+        # The real loguru logger exposes level() as a lookup method
+        level = 20
+    log_level = _LEVEL_NAMES.get(level, "info")
+    uvicorn.run(mcp, host=host, port=port, reload=reload, log_level=log_level, loop=_loop_implementation())
+
+
+def main() -> None:
+    """CLI entry point for the MCP server."""
+    fire.Fire(start_mcp_server)
+
+
+if __name__ == "__main__":
+    main()
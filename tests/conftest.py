@@ -1,17 +1,215 @@
 """Pytest configuration and shared fixtures for claif tests."""
 
+from __future__ import annotations
+
 import asyncio
+import os
 import sys
 from collections.abc import AsyncIterator
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import ModuleType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from claif.common.types import ClaifOptions, ClaifResponse, Message, MessageRole, Provider, ResponseMetrics, TextBlock
+from claif.common.types import (
+    ClaifOptions,
+    ClaifResponse,
+    Message,
+    MessageRole,
+    Provider,
+    ResponseMetrics,
+    TextBlock,
+)
+
+# Provider packages live in separate repos and are not test dependencies.
+# Install one set of stub modules per session instead of rebuilding
+# patch.dict("sys.modules", {...}) MagicMock chains in every test.
+_PROVIDER_STUBS = {
+    "claude": ("claif_cla", "ClaudeClient"),
+    "gemini": ("claif_gem", "GeminiClient"),
+    "codex": ("claif_cod", "CodexClient"),
+    "lms": ("claif_lms", "LMSClient"),
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _stub_provider_packages():
+    """Install stub provider modules into sys.modules once per session."""
+    saved = {}
+    clients = {}
+    for provider, (package, client_name) in _PROVIDER_STUBS.items():
+        client_class = MagicMock(name=f"{package}.client.{client_name}")
+        client_module = ModuleType(f"{package}.client")
+        setattr(client_module, client_name, client_class)
+        package_module = ModuleType(package)
+        package_module.client = client_module
+        for module_name, module in ((package, package_module), (f"{package}.client", client_module)):
+            saved[module_name] = sys.modules.get(module_name)
+            sys.modules[module_name] = module
+        clients[provider] = client_class
+    yield SimpleNamespace(**clients)
+    for module_name, original in saved.items():
+        if original is None:
+            sys.modules.pop(module_name, None)
+        else:
+            sys.modules[module_name] = original
+
+
+@pytest.fixture
+def provider_mocks(_stub_provider_packages):
+    """Provider client class mocks from the session stubs, reset per test."""
+    for mock in vars(_stub_provider_packages).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _stub_provider_packages
+
+
+@pytest.fixture(scope="session")
+def detected_providers(_stub_provider_packages):
+    """Resolve ClaifClient auto-detection once per scenario for the session.
+
+    Detection only reads os.environ and shutil.which, so each scenario runs
+    once under a scoped MonkeyPatch and both functional test modules share
+    the resulting provider names.
+    """
+    from claif.client import ClaifClient
+
+    scenarios = {
+        "claude": ({"ANTHROPIC_API_KEY": "test-key"}, None),
+        "gemini": ({"GEMINI_API_KEY": "test-key"}, None),
+        "codex": ({}, "/usr/local/bin/codex"),
+        "lms": ({}, None),
+    }
+    results = {}
+    for name, (env_vars, which_result) in scenarios.items():
+        with pytest.MonkeyPatch.context() as mp:
+            for key in list(os.environ):
+                mp.delenv(key, raising=False)
+            for key, value in env_vars.items():
+                mp.setenv(key, value)
+            mp.setattr("shutil.which", lambda _name, _result=which_result: _result)
+            ClaifClient._is_codex_available.cache_clear()
+            results[name] = ClaifClient().provider
+    ClaifClient._is_codex_available.cache_clear()
+    return results
+
+
+@pytest.fixture(autouse=True)
+def _fast_sleep(monkeypatch):
+    """Collapse asyncio.sleep delays to zero for every test.
+
+    ClaifOptions defaults retry_delay to a full second; any test touching
+    a retry/backoff path would pay it in real time. Sleeping for zero
+    still yields to the event loop, so scheduling behavior is preserved.
+    """
+    real_sleep = asyncio.sleep
+
+    async def _instant_sleep(_delay, result=None):
+        return await real_sleep(0, result)
+
+    monkeypatch.setattr(asyncio, "sleep", _instant_sleep)
+
+
+@pytest.fixture(scope="session")
+def server_module():
+    """Import claif.server once and share the module object across tests.
+
+    The FastMCP app and tool registration run at import; sharing the
+    module keeps that cost to one payment per session and gives tests a
+    stable target for monkeypatch.setattr.
+    """
+    import claif.server
+
+    return claif.server
+
+
+class _AsyncList:
+    """Minimal async iterable over a pre-built item list.
+
+    Much cheaper than compiling an async generator per call: no
+    coroutine frame or async-gen machinery, just a plain iterator
+    behind __anext__.
+    """
+
+    def __init__(self, items):
+        self._it = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class _AsyncRaise:
+    """Async iterable whose first __anext__ raises the given error."""
+
+    def __init__(self, error):
+        self._error = error
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise self._error
+
+
+class _QueryStub:
+    """Deterministic stand-in for the claif.server query generators.
+
+    One instance replaces query/query_random for a test; tests configure
+    the next outcome through the small set_* API instead of building a
+    fresh MagicMock/AsyncMock chain per test. Calls (prompt, options)
+    are recorded for assertion. Each call returns a hand-rolled async
+    iterable rather than an async generator, skipping the per-call
+    coroutine setup entirely.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self._content = "stub response"
+        self._error = None
+        self._provider = None
+
+    def yield_message(self, content):
+        """Make every subsequent call yield one assistant message."""
+        self._content = content
+        self._error = None
+
+    def raise_error(self, error):
+        """Make every subsequent call raise the given exception."""
+        self._error = error
+
+    def select_provider(self, provider):
+        """Record the given provider on the caller's options, like query_random."""
+        self._provider = provider
+
+    @property
+    def call_count(self):
+        return len(self.calls)
+
+    def __call__(self, prompt, options):
+        self.calls.append((prompt, options))
+        if self._provider is not None:
+            options.provider = self._provider
+        if self._error is not None:
+            return _AsyncRaise(self._error)
+        return _AsyncList([Message(role=MessageRole.ASSISTANT, content=self._content)])
+
+
+@pytest.fixture
+def query_stub(server_module, monkeypatch):
+    """Install one _QueryStub over the server's query generators."""
+    stub = _QueryStub()
+    monkeypatch.setattr(server_module, "query", stub)
+    monkeypatch.setattr(server_module, "query_random", stub)
+    return stub
 
 
 class MockProvider:
@@ -13,6 +13,12 @@ from claif.common.errors import (
 )
 
 
+def _check(error, message, **details):
+    """Assert an error's message suffix and exact details in one call."""
+    assert error.message.endswith(message)
+    assert error.details == details
+
+
 class TestClaifError:
     """Test base ClaifError class."""
 
@@ -28,9 +34,7 @@ class TestClaifError:
         details = {"code": 500, "context": "API call failed"}
         error = ClaifError("Error occurred", details=details)
         assert str(error) == "Error occurred"
-        assert error.message == "Error occurred"
-        assert error.details["code"] == 500
-        assert error.details["context"] == "API call failed"
+        _check(error, "Error occurred", code=500, context="API call failed")
 
     def test_claif_error_inheritance(self):
         """Test that ClaifError inherits from Exception."""
@@ -59,8 +63,7 @@ class TestProviderError:
         error = ProviderError("gemini", "API call failed", details=details)
         assert str(error) == "gemini: API call failed"
         assert error.provider == "gemini"
-        assert error.details["endpoint"] == "/v1/chat"
-        assert error.details["status"] == 503
+        _check(error, "API call failed", endpoint="/v1/chat", status=503)
 
     def test_provider_error_inheritance(self):
         """Test ProviderError inheritance chain."""
@@ -80,10 +83,8 @@ class TestConfigurationError:
 
     def test_config_error_with_details(self):
         """Test ConfigurationError with details."""
-        details = {"field": "api_key", "reason": "missing"}
-        error = ConfigurationError("Missing required field", details=details)
-        assert error.details["field"] == "api_key"
-        assert error.details["reason"] == "missing"
+        error = ConfigurationError("Missing required field", details={"field": "api_key", "reason": "missing"})
+        _check(error, "Missing required field", field="api_key", reason="missing")
 
     def test_config_error_inheritance(self):
         """Test ConfigurationError inheritance."""
@@ -103,10 +104,8 @@ class TestSessionError:
 
     def test_session_error_with_details(self):
         """Test SessionError with session details."""
-        details = {"session_id": "abc123", "duration": 3600}
-        error = SessionError("Session timeout", details=details)
-        assert error.details["session_id"] == "abc123"
-        assert error.details["duration"] == 3600
+        error = SessionError("Session timeout", details={"session_id": "abc123", "duration": 3600})
+        _check(error, "Session timeout", session_id="abc123", duration=3600)
 
     def test_session_error_inheritance(self):
         """Test SessionError inheritance."""
@@ -125,11 +124,8 @@ class TestTransportError:
 
     def test_transport_error_with_details(self):
         """Test TransportError with network details."""
-        details = {"host": "api.example.com", "port": 443, "protocol": "https"}
-        error = TransportError("Network timeout", details=details)
-        assert error.details["host"] == "api.example.com"
-        assert error.details["port"] == 443
-        assert error.details["protocol"] == "https"
+        error = TransportError("Network timeout", details={"host": "api.example.com", "port": 443, "protocol": "https"})
+        _check(error, "Network timeout", host="api.example.com", port=443, protocol="https")
 
     def test_transport_error_inheritance(self):
         """Test TransportError inheritance."""
@@ -148,11 +144,10 @@ class TestClaifTimeoutError:
 
     def test_timeout_error_with_details(self):
         """Test ClaifTimeoutError with timeout details."""
-        details = {"timeout_seconds": 30, "operation": "query", "provider": "claude"}
-        error = ClaifTimeoutError("Query timeout", details=details)
-        assert error.details["timeout_seconds"] == 30
-        assert error.details["operation"] == "query"
-        assert error.details["provider"] == "claude"
+        error = ClaifTimeoutError(
+            "Query timeout", details={"timeout_seconds": 30, "operation": "query", "provider": "claude"}
+        )
+        _check(error, "Query timeout", timeout_seconds=30, operation="query", provider="claude")
 
     def test_timeout_error_inheritance(self):
         """Test ClaifTimeoutError inheritance."""
@@ -171,11 +166,11 @@ class TestValidationError:
 
     def test_validation_error_with_field_details(self):
         """Test ValidationError with field validation details."""
-        details = {"field": "temperature", "value": 3.0, "constraint": "Must be between 0 and 2"}
-        error = ValidationError("Invalid temperature value", details=details)
-        assert error.details["field"] == "temperature"
-        assert error.details["value"] == 3.0
-        assert error.details["constraint"] == "Must be between 0 and 2"
+        error = ValidationError(
+            "Invalid temperature value",
+            details={"field": "temperature", "value": 3.0, "constraint": "Must be between 0 and 2"},
+        )
+        _check(error, "Invalid temperature value", field="temperature", value=3.0, constraint="Must be between 0 and 2")
 
     def test_validation_error_inheritance(self):
         """Test ValidationError inheritance."""
@@ -186,48 +181,68 @@ class TestValidationError:
 class TestErrorScenarios:
     """Test common error scenarios."""
 
-    def test_provider_initialization_errors(self):
-        """Test errors during provider initialization."""
-        # Missing API key
-        error1 = ConfigurationError("Missing API key", details={"provider": "claude", "field": "api_key"})
-        assert "Missing API key" in str(error1)
-
-        # Invalid provider
-        error2 = ValidationError(
-            "Invalid provider name", details={"provider": "unknown", "valid_providers": ["claude", "gemini", "codex"]}
-        )
-        assert "Invalid provider name" in str(error2)
-
-    def test_runtime_errors(self):
-        """Test errors during runtime operations."""
-        # Network timeout
-        error1 = TransportError("Connection timeout", details={"url": "https://api.anthropic.com", "timeout": 30})
-        assert "Connection timeout" in str(error1)
-
-        # Provider API error
-        error2 = ProviderError("claude", "API rate limit exceeded", details={"retry_after": 60, "limit": 1000})
-        assert str(error2) == "claude: API rate limit exceeded"
+    @pytest.fixture(scope="session")
+    def all_errors(self):
+        """Build one error of each type once per session."""
+        return [
+            ClaifError("Base error"),
+            ProviderError("claude", "Provider error"),
+            ConfigurationError("Config error"),
+            SessionError("Session error"),
+            TransportError("Transport error"),
+            ClaifTimeoutError("Timeout error"),
+            ValidationError("Validation error"),
+        ]
 
-        # Query timeout
-        error3 = ClaifTimeoutError("Query timeout after 30s", details={"provider": "gemini", "prompt_length": 5000})
-        assert "Query timeout after 30s" in str(error3)
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            pytest.param(
+                ConfigurationError("Missing API key", details={"provider": "claude", "field": "api_key"}),
+                "Missing API key",
+                id="missing-api-key",
+            ),
+            pytest.param(
+                ValidationError(
+                    "Invalid provider name",
+                    details={"provider": "unknown", "valid_providers": ["claude", "gemini", "codex"]},
+                ),
+                "Invalid provider name",
+                id="invalid-provider",
+            ),
+            pytest.param(
+                TransportError("Connection timeout", details={"url": "https://api.anthropic.com", "timeout": 30}),
+                "Connection timeout",
+                id="network-timeout",
+            ),
+            pytest.param(
+                ClaifTimeoutError("Query timeout after 30s", details={"provider": "gemini", "prompt_length": 5000}),
+                "Query timeout after 30s",
+                id="query-timeout",
+            ),
+        ],
+    )
+    def test_scenario_error_messages(self, error, expected):
+        """Test errors from common scenarios carry their message."""
+        assert expected in str(error)
+
+    def test_provider_api_error_message(self):
+        """Test provider API errors prefix the provider name."""
+        error = ProviderError("claude", "API rate limit exceeded", details={"retry_after": 60, "limit": 1000})
+        assert str(error) == "claude: API rate limit exceeded"
 
     def test_error_chaining(self):
         """Test error chaining and context."""
-        try:
-            try:
-                msg = "Network issue"
-                raise TransportError(msg)
-            except TransportError as e:
-                msg = "claude"
-                raise ProviderError(
-                    msg, "Request failed due to network error", details={"original_error": str(e)}
-                ) from e
-        except ProviderError as e:
-            assert e.__cause__ is not None
-            assert isinstance(e.__cause__, TransportError)
-            assert str(e.__cause__) == "Network issue"
-            assert e.details["original_error"] == "Network issue"
+        # Wire __cause__ directly; the raise-from machinery is interpreter
+        # behavior, and the data shape is what this test covers
+        cause = TransportError("Network issue")
+        error = ProviderError("claude", "Request failed due to network error", details={"original_error": str(cause)})
+        error.__cause__ = cause
+
+        assert error.__cause__ is not None
+        assert isinstance(error.__cause__, TransportError)
+        assert str(error.__cause__) == "Network issue"
+        assert error.details["original_error"] == "Network issue"
 
     def test_error_handling_patterns(self):
         """Test common error handling patterns."""
@@ -245,24 +260,20 @@ class TestErrorScenarios:
         result = handle_provider_error()
         assert result == "Provider claude failed with status 500"
 
-    def test_error_comparison(self):
-        """Test error comparison and type checking."""
-        errors = [
-            ClaifError("Base error"),
-            ProviderError("claude", "Provider error"),
-            ConfigurationError("Config error"),
-            SessionError("Session error"),
-            TransportError("Transport error"),
-            ClaifTimeoutError("Timeout error"),
-            ValidationError("Validation error"),
-        ]
-
-        # All should be ClaifError instances
-        for error in errors:
-            assert isinstance(error, ClaifError)
-
-        # Specific type checks
-        assert isinstance(errors[1], ProviderError)
-        assert not isinstance(errors[0], ProviderError)
-        assert isinstance(errors[2], ConfigurationError)
-        assert isinstance(errors[5], ClaifTimeoutError)
+    @pytest.mark.parametrize("idx", range(7))
+    def test_all_errors_are_claif_errors(self, idx, all_errors):
+        """Test every error type is a ClaifError instance."""
+        assert isinstance(all_errors[idx], ClaifError)
+
+    @pytest.mark.parametrize(
+        ("idx", "error_cls", "expected"),
+        [
+            (1, ProviderError, True),
+            (0, ProviderError, False),
+            (2, ConfigurationError, True),
+            (5, ClaifTimeoutError, True),
+        ],
+    )
+    def test_specific_error_types(self, idx, error_cls, expected, all_errors):
+        """Test specific type checks against the shared error list."""
+        assert isinstance(all_errors[idx], error_cls) == expected
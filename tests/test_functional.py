@@ -1,147 +1,162 @@
 # this_file: claif/tests/test_functional.py
 """Functional tests for the main claif package that validate unified client behavior."""
 
-import os
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
 
 import pytest
-from openai.types.chat import ChatCompletion, ChatCompletionChunk
-from openai.types.chat.chat_completion import Choice
-from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
-from openai.types.chat.chat_completion_chunk import ChoiceDelta
-from openai.types.chat.chat_completion_message import ChatCompletionMessage
-from openai.types.completion_usage import CompletionUsage
 
 from claif.client import ClaifClient
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletion
+
+
+def _canned_response(provider_id: str, model: str, content: str) -> "ChatCompletion":
+    """Build a canned ChatCompletion for a provider.
+
+    The openai.types imports live here rather than at module top: importing
+    them builds pydantic model classes, which slows collection even for runs
+    that select no test in this file.
+    """
+    from openai.types.chat import ChatCompletion
+    from openai.types.chat.chat_completion import Choice
+    from openai.types.chat.chat_completion_message import ChatCompletionMessage
+    from openai.types.completion_usage import CompletionUsage
+
+    return ChatCompletion(
+        id=f"chatcmpl-{provider_id}",
+        object="chat.completion",
+        created=1234567890,
+        model=model,
+        choices=[
+            Choice(
+                index=0,
+                message=ChatCompletionMessage(role="assistant", content=content),
+                finish_reason="stop",
+                logprobs=None,
+            )
+        ],
+        usage=CompletionUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+    )
+
+
+# Canned responses are session-scoped: pydantic validation of the nested
+# Choice/Message/Usage models is the expensive part of mock setup, and the
+# responses are read-only so they are safe to share across tests. The thin
+# MagicMock wrapper is rebuilt per test instead of copied, because copied
+# MagicMocks share recorded-call state with their template.
+@pytest.fixture(scope="session")
+def _canned_claude_response():
+    """Build the canned Claude ChatCompletion once per session."""
+    return _canned_response("claude", "claude-3-5-sonnet-20241022", "Hello from Claude!")
+
+
+@pytest.fixture(scope="session")
+def _canned_gemini_response():
+    """Build the canned Gemini ChatCompletion once per session."""
+    return _canned_response("gemini", "gemini-1.5-pro", "Hello from Gemini!")
+
+
+@pytest.fixture(scope="session")
+def _canned_codex_response():
+    """Build the canned Codex ChatCompletion once per session."""
+    return _canned_response("codex", "gpt-4o", "Hello from Codex!")
+
+
+@pytest.fixture(scope="session")
+def _canned_stream_chunks():
+    """Build the canned streaming chunks once per session.
+
+    The chunks are plain namespaces rather than MagicMock chains: the test
+    only reads .choices[0].delta.content, and SimpleNamespace attribute
+    access skips MagicMock's child-mock bookkeeping. They are read-only, so
+    tests share the list and wrap it in a fresh iterator per use.
+    """
+    return [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+        for word in ["Hello", " from", " Claude!"]
+    ]
+
+
+@pytest.fixture(scope="session")
+def _canned_lms_response():
+    """Build the canned LMS ChatCompletion once per session."""
+    return _canned_response("lms", "local-model", "Hello from LM Studio!")
+
+
+def _provider_mock(canned_response: "ChatCompletion") -> MagicMock:
+    """Create a provider client mock wired to a shared canned response."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = canned_response
+    return mock_client
+
 
 class TestClaifClientFunctional:
     """Functional tests for the unified ClaifClient."""
 
     @pytest.fixture
-    def mock_claude_client(self):
-        """Create a mock Claude client."""
-        mock_client = MagicMock()
-        mock_chat = MagicMock()
-        mock_completions = MagicMock()
-        mock_client.chat = mock_chat
-        mock_chat.completions = mock_completions
-
-        # Setup response
-        timestamp = 1234567890
-        mock_response = ChatCompletion(
-            id="chatcmpl-claude",
-            object="chat.completion",
-            created=timestamp,
-            model="claude-3-5-sonnet-20241022",
-            choices=[
-                Choice(
-                    index=0,
-                    message=ChatCompletionMessage(role="assistant", content="Hello from Claude!"),
-                    finish_reason="stop",
-                    logprobs=None,
-                )
-            ],
-            usage=CompletionUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
-        )
-        mock_completions.create.return_value = mock_response
-        return mock_client
-
-    def test_provider_auto_detection_claude(self):
-        """Test auto-detection of Claude provider based on env var."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
-            client = ClaifClient()
-            assert client.provider == "claude"
-
-    def test_provider_auto_detection_gemini(self):
-        """Test auto-detection of Gemini provider based on env var."""
-        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}, clear=True):
-            client = ClaifClient()
-            assert client.provider == "gemini"
-
-    def test_provider_auto_detection_codex(self):
-        """Test auto-detection of Codex provider based on CLI availability."""
-        with patch.dict(os.environ, {}, clear=True), patch("shutil.which", return_value="/usr/local/bin/codex"):
-            client = ClaifClient()
-            assert client.provider == "codex"
-
-    def test_provider_auto_detection_lms(self):
-        """Test auto-detection of LMS provider as default."""
-        with patch.dict(os.environ, {}, clear=True), patch("shutil.which", return_value=None):
-            client = ClaifClient()
-            assert client.provider == "lms"
-
-    def test_explicit_provider_selection(self):
-        """Test explicit provider selection overrides auto-detection."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
-            client = ClaifClient(provider="gemini")
-            assert client.provider == "gemini"
-
-    @patch("claif_cla.client.ClaudeClient")
-    def test_claude_client_initialization(self, mock_claude_class):
-        """Test Claude client is properly initialized."""
-        mock_claude_class.return_value = MagicMock()
-
-        client = ClaifClient(provider="claude", api_key="test-key", timeout=300)
+    def claude_mock(self, _canned_claude_response):
+        """Create a mock Claude client from the shared canned response."""
+        return _provider_mock(_canned_claude_response)
 
-        # Verify ClaudeClient was created with correct params
-        mock_claude_class.assert_called_once_with(api_key="test-key", timeout=300)
-        assert client._client is not None
-
-    @patch("claif_gem.client.GeminiClient")
-    def test_gemini_client_initialization(self, mock_gemini_class):
-        """Test Gemini client is properly initialized."""
-        mock_gemini_class.return_value = MagicMock()
-
-        client = ClaifClient(provider="gemini", api_key="test-key", cli_path="/custom/path")
-
-        # Verify GeminiClient was created with correct params
-        mock_gemini_class.assert_called_once_with(api_key="test-key", cli_path="/custom/path")
-        assert client._client is not None
+    @pytest.fixture
+    def gemini_mock(self, _canned_gemini_response):
+        """Create a mock Gemini client from the shared canned response."""
+        return _provider_mock(_canned_gemini_response)
 
-    @patch("claif_cod.client.CodexClient")
-    def test_codex_client_initialization(self, mock_codex_class):
-        """Test Codex client is properly initialized."""
-        mock_codex_class.return_value = MagicMock()
+    @pytest.fixture
+    def codex_mock(self, _canned_codex_response):
+        """Create a mock Codex client from the shared canned response."""
+        return _provider_mock(_canned_codex_response)
 
-        client = ClaifClient(provider="codex", working_dir="/tmp/project")
+    @pytest.fixture
+    def lms_mock(self, _canned_lms_response):
+        """Create a mock LMS client from the shared canned response."""
+        return _provider_mock(_canned_lms_response)
 
-        # Verify CodexClient was created without api_key
-        mock_codex_class.assert_called_once_with(working_dir="/tmp/project")
-        assert client._client is not None
+    @pytest.fixture
+    def mock_claude_client(self, claude_mock):
+        """Create a mock Claude client."""
+        return claude_mock
 
-    @patch("claif_lms.client.LMSClient")
-    def test_lms_client_initialization(self, mock_lms_class):
-        """Test LMS client is properly initialized."""
-        mock_lms_class.return_value = MagicMock()
+    @pytest.mark.parametrize("provider", ["claude", "gemini", "codex", "lms"])
+    def test_provider_auto_detection(self, provider, detected_providers):
+        """Test auto-detection resolves each env/CLI scenario to its provider."""
+        assert detected_providers[provider] == provider
 
-        client = ClaifClient(provider="lms", api_key="test-key", base_url="http://localhost:1234")
+    def test_explicit_provider_selection(self, monkeypatch):
+        """Test explicit provider selection overrides auto-detection."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        client = ClaifClient(provider="gemini")
+        assert client.provider == "gemini"
 
-        # Verify LMSClient was created with correct params
-        mock_lms_class.assert_called_once_with(api_key="test-key", base_url="http://localhost:1234")
+    @pytest.mark.parametrize(
+        ("provider", "kwargs"),
+        [
+            ("claude", {"api_key": "test-key", "timeout": 300}),
+            ("gemini", {"api_key": "test-key", "cli_path": "/custom/path"}),
+            # Codex takes no api_key
+            ("codex", {"working_dir": "/tmp/project"}),
+            ("lms", {"api_key": "test-key", "base_url": "http://localhost:1234"}),
+        ],
+    )
+    def test_provider_client_initialization(self, provider, kwargs, provider_mocks):
+        """Test each provider client is created with the expected params."""
+        client = ClaifClient(provider=provider, **kwargs)
+
+        getattr(provider_mocks, provider).assert_called_once_with(**kwargs)
         assert client._client is not None
 
     def test_unknown_provider_error(self):
         """Test error is raised for unknown provider."""
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match="Unknown provider: unknown"):
             ClaifClient(provider="unknown")
 
-        assert "Unknown provider: unknown" in str(exc_info.value)
-
-    @patch("claif_cla.client.ClaudeClient")
-    def test_chat_completions_create(self, mock_claude_class):
+    def test_chat_completions_create(self, provider_mocks, claude_mock, _canned_claude_response):
         """Test chat.completions.create delegates to provider client."""
-        # Setup mock client
-        mock_client = MagicMock()
-        mock_chat = MagicMock()
-        mock_completions = MagicMock()
-        mock_client.chat = mock_chat
-        mock_chat.completions = mock_completions
-
-        # Setup response
-        mock_response = MagicMock(spec=ChatCompletion)
-        mock_completions.create.return_value = mock_response
-        mock_claude_class.return_value = mock_client
+        provider_mocks.claude.return_value = claude_mock
 
         # Create Claif client
         client = ClaifClient(provider="claude")
@@ -151,31 +166,19 @@ class TestClaifClientFunctional:
             model="claude-3-5-sonnet-20241022", messages=[{"role": "user", "content": "Hello"}], temperature=0.7
         )
 
-        # Verify delegation
-        mock_completions.create.assert_called_once_with(
-            model="claude-3-5-sonnet-20241022", messages=[{"role": "user", "content": "Hello"}], temperature=0.7
-        )
-        assert response == mock_response
+        # Verify delegation - the implementation forwards all params, with
+        # NOT_GIVEN placeholders for the ones the caller omitted
+        claude_mock.chat.completions.create.assert_called_once()
+        call_args = claude_mock.chat.completions.create.call_args
+        assert call_args.kwargs["model"] == "claude-3-5-sonnet-20241022"
+        assert call_args.kwargs["messages"] == [{"role": "user", "content": "Hello"}]
+        assert call_args.kwargs["temperature"] == 0.7
+        assert response == _canned_claude_response
 
-    @patch("claif_cla.client.ClaudeClient")
-    def test_streaming_support(self, mock_claude_class):
+    def test_streaming_support(self, provider_mocks, claude_mock, _canned_stream_chunks):
         """Test streaming response handling."""
-        # Setup mock client
-        mock_client = MagicMock()
-        mock_chat = MagicMock()
-        mock_completions = MagicMock()
-        mock_client.chat = mock_chat
-        mock_chat.completions = mock_completions
-
-        # Create mock stream
-        def mock_stream():
-            for word in ["Hello", " from", " Claude!"]:
-                chunk = MagicMock(spec=ChatCompletionChunk)
-                chunk.choices = [MagicMock(delta=MagicMock(content=word))]
-                yield chunk
-
-        mock_completions.create.return_value = mock_stream()
-        mock_claude_class.return_value = mock_client
+        claude_mock.chat.completions.create.return_value = iter(_canned_stream_chunks)
+        provider_mocks.claude.return_value = claude_mock
 
         # Create Claif client
         client = ClaifClient(provider="claude")
@@ -193,23 +196,19 @@ class TestClaifClientFunctional:
         content = "".join(c.choices[0].delta.content for c in chunks)
         assert content == "Hello from Claude!"
 
-    @patch("claif_cla.client.ClaudeClient")
-    @patch("claif_gem.client.GeminiClient")
-    def test_provider_switching(self, mock_gemini_class, mock_claude_class):
+    def test_provider_switching(self, provider_mocks, claude_mock, gemini_mock):
         """Test switching between providers by creating new client instances."""
         # Setup mock clients
-        mock_claude = MagicMock()
-        mock_gemini = MagicMock()
-        mock_claude_class.return_value = mock_claude
-        mock_gemini_class.return_value = mock_gemini
+        provider_mocks.claude.return_value = claude_mock
+        provider_mocks.gemini.return_value = gemini_mock
 
         # Create Claude client
         claude_client = ClaifClient(provider="claude")
-        assert claude_client._client == mock_claude
+        assert claude_client._client == claude_mock
 
         # Create Gemini client (new instance)
         gemini_client = ClaifClient(provider="gemini")
-        assert gemini_client._client == mock_gemini
+        assert gemini_client._client == gemini_mock
 
         # Verify both are independent
         assert claude_client._client != gemini_client._client
@@ -1,11 +1,13 @@
 """Tests for claif.common.install module."""
 
-import os
+import sys
 from pathlib import Path
+from subprocess import CalledProcessError
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from claif.common import install as install_module
 from claif.common.install import (
     InstallError,
     check_bun_available,
@@ -14,9 +16,23 @@ from claif.common.install import (
     find_executable,
     get_install_dir,
     install_provider,
+    install_providers,
+    invalidate_executable_cache,
     uninstall_provider,
 )
-from claif.install import get_install_location, install_all_tools, uninstall_all_tools
+from claif.install import uninstall_all_tools
+
+
+@pytest.fixture(autouse=True)
+def _clear_install_caches():
+    """Reset memoized lookups so platform/env/which patches take effect."""
+    get_install_dir.cache_clear()
+    install_module._home_fallback.cache_clear()
+    invalidate_executable_cache()
+    yield
+    get_install_dir.cache_clear()
+    install_module._home_fallback.cache_clear()
+    invalidate_executable_cache()
 
 
 class TestInstallError:
@@ -32,23 +48,21 @@ class TestInstallError:
 class TestInstallDirectory:
     """Test install directory functions."""
 
-    @patch("platform.system")
-    def test_get_install_dir_windows(self, mock_system):
+    def test_get_install_dir_windows(self, monkeypatch):
         """Test getting install directory on Windows."""
-        mock_system.return_value = "Windows"
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setenv("LOCALAPPDATA", "C:\\Users\\Test\\AppData\\Local")
 
-        with patch.dict(os.environ, {"LOCALAPPDATA": "C:\\Users\\Test\\AppData\\Local"}):
-            result = get_install_dir()
-            assert result == Path("C:\\Users\\Test\\AppData\\Local\\Programs\\claif")
+        result = get_install_dir()
+        assert result == Path("C:\\Users\\Test\\AppData\\Local") / "Programs" / "claif"
 
-    @patch("platform.system")
-    def test_get_install_dir_unix(self, mock_system):
+    def test_get_install_dir_unix(self, monkeypatch):
         """Test getting install directory on Unix-like systems."""
-        mock_system.return_value = "Linux"
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setenv("HOME", "/home/user")
 
-        with patch("pathlib.Path.home", return_value=Path("/home/user")):
-            result = get_install_dir()
-            assert result == Path("/home/user/.local/bin")
+        result = get_install_dir()
+        assert result == Path("/home/user/.local/bin")
 
     def test_ensure_install_dir(self, tmp_path):
         """Test ensuring install directory exists."""
@@ -89,25 +103,23 @@ class TestBunInstallation:
 
         assert check_bun_available() is False
 
-    @patch("pathlib.Path.home")
-    def test_ensure_bun_installed_already_exists(self, mock_home):
+    def test_ensure_bun_installed_already_exists(self, monkeypatch):
         """Test ensure_bun_installed when bun already exists."""
-        mock_home.return_value = Path("/home/user")
+        monkeypatch.setenv("HOME", "/home/user")
 
-        with patch("pathlib.Path.exists", return_value=True), patch("pathlib.Path.is_file", return_value=True):
+        with patch("os.path.isfile", return_value=True):
             result = ensure_bun_installed()
             assert result is True
 
     @patch("subprocess.run")
     @patch("platform.system")
-    @patch("pathlib.Path.home")
-    def test_ensure_bun_installed_install(self, mock_home, mock_system, mock_run):
+    def test_ensure_bun_installed_install(self, mock_system, mock_run, monkeypatch):
         """Test installing bun when not present."""
-        mock_home.return_value = Path("/home/user")
+        monkeypatch.setenv("HOME", "/home/user")
         mock_system.return_value = "Linux"
         mock_run.return_value = MagicMock(returncode=0)
 
-        with patch("pathlib.Path.exists", return_value=False):
+        with patch("os.path.isfile", return_value=False):
             result = ensure_bun_installed()
 
             assert result is True
@@ -121,6 +133,19 @@ class TestBunInstallation:
     # TODO: Add these back when run_bun_install is implemented
 
 
+def _fake_scandir(names):
+    """Build an os.scandir stand-in yielding file DirEntry mocks for names."""
+    entries = []
+    for name in names:
+        entry = MagicMock()
+        entry.name = name
+        entry.is_file.return_value = True
+        entries.append(entry)
+    scandir_cm = MagicMock()
+    scandir_cm.__enter__.return_value = iter(entries)
+    return scandir_cm
+
+
 class TestExecutableFinding:
     """Test executable finding functions."""
 
@@ -135,18 +160,17 @@ class TestExecutableFinding:
         mock_which.assert_called_once_with("test-exe")
 
     @patch("shutil.which")
-    @patch("pathlib.Path.home")
-    def test_find_executable_in_home(self, mock_home, mock_which):
+    def test_find_executable_in_home(self, mock_which, monkeypatch):
         """Test finding executable in home directory."""
         mock_which.return_value = None
-        mock_home.return_value = Path("/home/user")
+        monkeypatch.setenv("HOME", "/home/user")
 
         locations = [Path("/home/user/.local/bin/test-exe"), Path("/home/user/.bun/bin/test-exe")]
 
-        def exists_side_effect(self):
-            return self in locations
-
-        with patch("pathlib.Path.exists", exists_side_effect):
+        with (
+            patch("os.stat", return_value=MagicMock(st_mtime_ns=0)),
+            patch("os.scandir", side_effect=lambda _d: _fake_scandir(["test-exe"])),
+        ):
             result = find_executable("test-exe")
             assert result in locations
 
@@ -155,7 +179,7 @@ class TestExecutableFinding:
         """Test when executable is not found."""
         mock_which.return_value = None
 
-        with patch("pathlib.Path.exists", return_value=False):
+        with patch("os.scandir", side_effect=lambda _d: _fake_scandir([])):
             result = find_executable("missing-exe")
             assert result is None
 
@@ -200,6 +224,17 @@ class TestProviderInstallation:
         mock_ensure_bun.assert_called_once()
         mock_bun_install.assert_called_once_with("@test/provider")
 
+    @patch("subprocess.run")
+    def test_install_providers_batched(self, mock_run):
+        """Test batched install spawns a single subprocess for many packages."""
+        mock_run.return_value = MagicMock(returncode=0)
+
+        install_providers(["pkg-a", "pkg-b", "pkg-c"], method="pip")
+
+        assert mock_run.call_count == 1
+        args = mock_run.call_args[0][0]
+        assert args[-3:] == ["pkg-a", "pkg-b", "pkg-c"]
+
     def test_install_provider_invalid_method(self):
         """Test installing with invalid method."""
         with pytest.raises(InstallError) as exc_info:
@@ -222,6 +257,32 @@ class TestProviderInstallation:
         assert "test-provider" in args
 
 
+class TestUninstallAllTools:
+    """Test the parallel uninstall fan-out."""
+
+    def test_uninstall_all_tools_success(self, monkeypatch):
+        """Test all packages report success when every uninstall succeeds."""
+        monkeypatch.setattr("claif.install.uninstall_provider", lambda _package, _method: None)
+
+        results = uninstall_all_tools()
+
+        assert results == {"claif_cla": True, "claif_gem": True, "claif_cod": True}
+
+    def test_uninstall_all_tools_partial_failure(self, monkeypatch):
+        """Test one failed uninstall is reported without affecting the others."""
+
+        def fake_uninstall(package, _method):
+            if package == "claif_gem":
+                msg = f"Failed to uninstall {package}"
+                raise InstallError(msg)
+
+        monkeypatch.setattr("claif.install.uninstall_provider", fake_uninstall)
+
+        results = uninstall_all_tools()
+
+        assert results == {"claif_cla": True, "claif_gem": False, "claif_cod": True}
+
+
 # Commented out TestBundledExecutables - functions not implemented yet
 # class TestBundledExecutables:
 #     """Test bundled executable functions."""
@@ -245,9 +306,10 @@ class TestInstallIntegration:
     @patch("subprocess.run")
     def test_install_flow_failure(self, mock_run):
         """Test failed installation flow."""
-        mock_run.return_value = MagicMock(returncode=1, stderr="Permission denied")
+        mock_run.side_effect = CalledProcessError(1, ["pip"], stderr=b"Permission denied")
 
         with pytest.raises(InstallError) as exc_info:
             install_provider("test-package", method="pip")
 
         assert "Failed to install" in str(exc_info.value)
+        assert "Permission denied" in str(exc_info.value)
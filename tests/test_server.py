@@ -1,20 +1,13 @@
 """Tests for claif.server module."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
-import pytest
-from pydantic import BaseModel
-
-from claif.common.types import Message, MessageRole, Provider
+from claif.common.types import Message, MessageRole, Provider, TextBlock
 from claif.server import (
     ProviderInfo,
     QueryRequest,
     QueryResponse,
-    claif_health_check,
-    claif_list_providers,
-    claif_query,
-    claif_query_all,
-    claif_query_random,
     main,
     mcp,
     start_mcp_server,
@@ -24,21 +17,15 @@ from claif.server import (
 class TestClaifQuery:
     """Test claif_query tool."""
 
-    @patch("claif.server.query")
-    async def test_query_basic(self, mock_query):
+    async def test_query_basic(self, server_module, query_stub):
         """Test basic query operation."""
-
-        # Mock response
-        async def mock_query_gen(prompt, options):
-            yield Message(role=MessageRole.ASSISTANT, content="Test response")
-
-        mock_query.return_value = mock_query_gen("Test", MagicMock())
+        query_stub.yield_message("Test response")
 
         # Create request
         request = QueryRequest(prompt="Test query", provider="claude", temperature=0.7, max_tokens=100)
 
         # Execute query
-        response = await claif_query(request)
+        response = await server_module.claif_query(request)
 
         assert isinstance(response, QueryResponse)
         assert len(response.messages) == 1
@@ -46,31 +33,42 @@ class TestClaifQuery:
         assert response.messages[0]["content"] == "Test response"
         assert response.provider == "claude"
 
-    @patch("claif.server.query")
-    async def test_query_invalid_provider(self, mock_query):
+    async def test_query_flattens_block_content(self, server_module, query_stub):
+        """Test block-list content serializes to a single string."""
+        query_stub.yield_message([TextBlock(text="Hello, "), TextBlock(text="world")])
+
+        request = QueryRequest(prompt="Test query", provider="claude")
+        response = await server_module.claif_query(request)
+
+        assert response.messages[0]["content"] == "Hello, world"
+
+    async def test_options_reuse_for_identical_requests(self, server_module, query_stub):
+        """Test identical requests share one memoized options instance."""
+        request = QueryRequest(prompt="First", provider="claude", temperature=0.7)
+        repeat = QueryRequest(prompt="Second", provider="claude", temperature=0.7)
+
+        await server_module.claif_query(request)
+        await server_module.claif_query(repeat)
+
+        (_, first_options), (_, second_options) = query_stub.calls
+        assert first_options is second_options
+
+    async def test_query_invalid_provider(self, server_module, query_stub):
         """Test query with invalid provider."""
         request = QueryRequest(prompt="Test", provider="invalid_provider")
 
-        response = await claif_query(request)
+        response = await server_module.claif_query(request)
 
         assert response.error is not None
         assert "Unknown provider" in response.error
         assert len(response.messages) == 0
 
-    @patch("claif.server.query")
-    async def test_query_error_handling(self, mock_query):
+    async def test_query_error_handling(self, server_module, query_stub):
         """Test query error handling."""
-
-        # Mock error
-        async def mock_query_error(prompt, options):
-            msg = "Test error"
-            raise RuntimeError(msg)
-            yield  # Make it a generator
-
-        mock_query.return_value = mock_query_error("Test", MagicMock())
+        query_stub.raise_error(RuntimeError("Test error"))
 
         request = QueryRequest(prompt="Test")
-        response = await claif_query(request)
+        response = await server_module.claif_query(request)
 
         assert response.error is not None
         assert "Test error" in response.error
@@ -80,42 +78,26 @@ class TestClaifQuery:
 class TestClaifQueryRandom:
     """Test claif_query_random tool."""
 
-    @patch("claif.server.query_random")
-    async def test_query_random(self, mock_query_random):
+    async def test_query_random(self, server_module, query_stub):
         """Test random provider query."""
-        # Mock response with provider tracking
-        mock_options = MagicMock()
-        mock_options.provider = Provider.GEMINI
-
-        async def mock_random_gen(prompt, options):
-            # Simulate provider selection
-            options.provider = Provider.GEMINI
-            yield Message(role=MessageRole.ASSISTANT, content="Random response")
-
-        mock_query_random.return_value = mock_random_gen("Test", mock_options)
+        query_stub.select_provider(Provider.GEMINI)
+        query_stub.yield_message("Random response")
 
         request = QueryRequest(prompt="Test query", temperature=0.5)
 
-        response = await claif_query_random(request)
+        response = await server_module.claif_query_random(request)
 
         assert isinstance(response, QueryResponse)
         assert len(response.messages) == 1
         assert response.messages[0]["content"] == "Random response"
         assert response.provider == "gemini"
 
-    @patch("claif.server.query_random")
-    async def test_query_random_error(self, mock_query_random):
+    async def test_query_random_error(self, server_module, query_stub):
         """Test random query error handling."""
-
-        async def mock_error_gen(prompt, options):
-            msg = "Random error"
-            raise Exception(msg)
-            yield
-
-        mock_query_random.return_value = mock_error_gen("Test", MagicMock())
+        query_stub.raise_error(Exception("Random error"))
 
         request = QueryRequest(prompt="Test")
-        response = await claif_query_random(request)
+        response = await server_module.claif_query_random(request)
 
         assert response.error is not None
         assert "Random error" in response.error
@@ -124,22 +106,29 @@ class TestClaifQueryRandom:
 class TestClaifQueryAll:
     """Test claif_query_all tool."""
 
-    @patch("claif.server.query_all")
-    async def test_query_all(self, mock_query_all):
-        """Test querying all providers."""
+    async def test_query_all(self, server_module, monkeypatch):
+        """Test querying all providers runs concurrently."""
+        started = 0
+        all_started = asyncio.Event()
+
+        def make_gen(content):
+            async def gen(prompt, options):
+                nonlocal started
+                started += 1
+                if started == 3:
+                    all_started.set()
+                # Serial collection would stall here until the timeout
+                await asyncio.wait_for(all_started.wait(), timeout=1)
+                if content is not None:
+                    yield Message(role=MessageRole.ASSISTANT, content=content)
 
-        # Mock parallel responses
-        async def mock_all_gen(prompt, options):
-            yield {
-                Provider.CLAUDE: [Message(role=MessageRole.ASSISTANT, content="Claude response")],
-                Provider.GEMINI: [Message(role=MessageRole.ASSISTANT, content="Gemini response")],
-                Provider.CODEX: [],
-            }
+            return gen("Test", MagicMock())
 
-        mock_query_all.return_value = mock_all_gen("Test", MagicMock())
+        mock_query = MagicMock(side_effect=[make_gen("Claude response"), make_gen("Gemini response"), make_gen(None)])
+        monkeypatch.setattr(server_module, "query", mock_query)
 
         request = QueryRequest(prompt="Test query")
-        responses = await claif_query_all(request)
+        responses = await server_module.claif_query_all(request)
 
         assert isinstance(responses, dict)
         assert "claude" in responses
@@ -150,31 +139,31 @@ class TestClaifQueryAll:
         assert responses["gemini"].messages[0]["content"] == "Gemini response"
         assert len(responses["codex"].messages) == 0
 
-    @patch("claif.server.query_all")
-    async def test_query_all_error(self, mock_query_all):
-        """Test parallel query error handling."""
+    async def test_query_all_error(self, server_module, monkeypatch):
+        """Test one provider's failure does not lose the other responses."""
 
         async def mock_error_gen(prompt, options):
             msg = "Parallel error"
             raise Exception(msg)
             yield
 
-        mock_query_all.return_value = mock_error_gen("Test", MagicMock())
+        monkeypatch.setattr(server_module, "query", mock_error_gen)
 
         request = QueryRequest(prompt="Test")
-        responses = await claif_query_all(request)
+        responses = await server_module.claif_query_all(request)
 
-        assert "error" in responses
-        assert responses["error"].error is not None
-        assert "Parallel error" in responses["error"].error
+        assert set(responses) == {"claude", "gemini", "codex"}
+        for response in responses.values():
+            assert response.error is not None
+            assert "Parallel error" in response.error
 
 
 class TestProviderTools:
     """Test provider listing and health check tools."""
 
-    async def test_list_providers(self):
+    async def test_list_providers(self, server_module):
         """Test listing all providers."""
-        providers = await claif_list_providers()
+        providers = await server_module.claif_list_providers()
 
         assert isinstance(providers, list)
         assert len(providers) == 3  # Claude, Gemini, Codex
@@ -187,79 +176,120 @@ class TestProviderTools:
         # All should be enabled by default
         assert all(p.enabled for p in providers)
 
-    @patch("claif.server.query")
-    async def test_health_check_single(self, mock_query):
+    async def test_health_check_single(self, server_module, query_stub, monkeypatch):
         """Test health check for single provider."""
+        monkeypatch.setattr(server_module, "_health_cache", {})
+        query_stub.yield_message("OK")
 
-        # Mock successful query
-        async def mock_query_gen(prompt, options):
-            yield Message(role=MessageRole.ASSISTANT, content="OK")
+        result = await server_module.claif_health_check(provider="claude")
+
+        assert result == {"claude": True}
 
-        mock_query.return_value = mock_query_gen("Hello", MagicMock())
+    async def test_health_check_all(self, server_module, monkeypatch):
+        """Test health check probes all providers concurrently."""
+        monkeypatch.setattr(server_module, "_health_cache", {})
+        started = 0
+        all_started = asyncio.Event()
+
+        def make_probe(fail):
+            async def probe_gen(prompt, options):
+                nonlocal started
+                started += 1
+                if started == 3:
+                    all_started.set()
+                # Serial probing would deadlock here until the timeout;
+                # gather-based fan-out lets all three proceed together
+                await asyncio.wait_for(all_started.wait(), timeout=1)
+                if fail:
+                    msg = "Connection error"
+                    raise Exception(msg)
+                yield Message(role=MessageRole.ASSISTANT, content="OK")
 
-        result = await claif_health_check(provider="claude")
+            return probe_gen("Hello", MagicMock())
 
-        assert result == {"claude": True}
+        mock_query = MagicMock(side_effect=[make_probe(False), make_probe(True), make_probe(False)])
+        monkeypatch.setattr(server_module, "query", mock_query)
 
-    @patch("claif.server.query")
-    async def test_health_check_all(self, mock_query):
-        """Test health check for all providers."""
-        # Mock mixed results
-        call_count = 0
+        result = await server_module.claif_health_check()
 
-        async def mock_query_gen(prompt, options):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:  # Claude succeeds
-                yield Message(role=MessageRole.ASSISTANT, content="OK")
-            elif call_count == 2:  # Gemini fails
-                msg = "Connection error"
-                raise Exception(msg)
-            else:  # Codex succeeds
-                yield Message(role=MessageRole.ASSISTANT, content="OK")
+        assert result == {"claude": True, "gemini": False, "codex": True}
 
-        mock_query.side_effect = [
-            mock_query_gen("Hello", MagicMock()),
-            mock_query_gen("Hello", MagicMock()),
-            mock_query_gen("Hello", MagicMock()),
-        ]
+    async def test_health_check_cached(self, server_module, query_stub, monkeypatch):
+        """Test healthy results are reused instead of re-probed."""
+        monkeypatch.setattr(server_module, "_health_cache", {})
+        query_stub.yield_message("OK")
 
-        result = await claif_health_check()
+        first = await server_module.claif_health_check()
+        second = await server_module.claif_health_check()
 
-        assert isinstance(result, dict)
-        assert len(result) == 3
-        # Results depend on execution order, but should have mix of True/False
+        assert first == second == {"claude": True, "gemini": True, "codex": True}
+        # Three probes on the first call, zero on the second
+        assert query_stub.call_count == 3
+
+    async def test_health_check_down_not_cached(self, server_module, query_stub, monkeypatch):
+        """Test failures are never cached and force a fresh probe."""
+        monkeypatch.setattr(server_module, "_health_cache", {})
+        query_stub.raise_error(Exception("Connection error"))
+
+        first = await server_module.claif_health_check(provider="claude")
+        second = await server_module.claif_health_check(provider="claude")
+
+        assert first == second == {"claude": False}
+        # The down provider is re-probed on every call
+        assert query_stub.call_count == 2
+
+    async def test_health_check_bypasses_cache(self, server_module, query_stub, monkeypatch):
+        """Test probes force-disable caching and retries."""
+        monkeypatch.setattr(server_module, "_health_cache", {})
+        query_stub.yield_message("OK")
+
+        await server_module.claif_health_check(provider="claude")
+
+        ((_prompt, options),) = query_stub.calls
+        assert options.cache is False
+        assert options.retry_count == 0
+        assert options.max_tokens == 1
 
 
 class TestServerStart:
     """Test server startup functionality."""
 
-    @patch("claif.server.uvicorn.run")
-    def test_start_mcp_server_default(self, mock_uvicorn_run):
-        """Test starting server with defaults."""
-        start_mcp_server()
+    def test_start_mcp_server_default(self):
+        """Test starting server with defaults uses uvloop where available."""
+        with (
+            patch("claif.server.uvicorn.run") as mock_uvicorn_run,
+            patch("claif.server._loop_implementation", return_value="uvloop"),
+        ):
+            start_mcp_server()
 
-        mock_uvicorn_run.assert_called_once_with(mcp, host="localhost", port=8000, reload=False, log_level="info")
+        mock_uvicorn_run.assert_called_once_with(
+            mcp, host="localhost", port=8000, reload=False, log_level="info", loop="uvloop"
+        )
 
-    @patch("claif.server.uvicorn.run")
-    @patch("claif.server.logger")
-    def test_start_mcp_server_custom(self, mock_logger, mock_uvicorn_run):
+    def test_start_mcp_server_custom(self):
         """Test starting server with custom settings."""
-        mock_logger.level = 30  # WARNING level
         mock_config = MagicMock(default_provider=Provider.GEMINI)
 
-        start_mcp_server(host="0.0.0.0", port=9000, reload=True, config=mock_config)
+        with (
+            patch("claif.server.uvicorn.run") as mock_uvicorn_run,
+            patch("claif.server.logger") as mock_logger,
+            patch("claif.server._loop_implementation", return_value="asyncio"),
+        ):
+            mock_logger.level = 30  # WARNING level
+            start_mcp_server(host="0.0.0.0", port=9000, reload=True, config=mock_config)
 
-        mock_uvicorn_run.assert_called_once_with(mcp, host="0.0.0.0", port=9000, reload=True, log_level="warning")
+        mock_uvicorn_run.assert_called_once_with(
+            mcp, host="0.0.0.0", port=9000, reload=True, log_level="warning", loop="asyncio"
+        )
 
 
 class TestServerMain:
     """Test server main entry point."""
 
-    @patch("claif.server.fire.Fire")
-    def test_main_function(self, mock_fire):
+    def test_main_function(self):
         """Test main function."""
-        main()
+        with patch("claif.server.fire.Fire") as mock_fire:
+            main()
 
         mock_fire.assert_called_once_with(start_mcp_server)
 
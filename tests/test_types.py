@@ -48,110 +48,110 @@ class TestMessage:
 class TestContentBlocks:
     """Test content block types."""
 
-    def test_text_block(self):
-        """Test TextBlock creation."""
-        block = TextBlock(text="Hello world")
-        assert block.type == "text"
-        assert block.text == "Hello world"
-
-    def test_text_block_defaults(self):
-        """Test TextBlock with defaults."""
-        block = TextBlock()
-        assert block.type == "text"
-        assert block.text == ""
-
-    def test_tool_use_block(self):
-        """Test ToolUseBlock creation."""
-        block = ToolUseBlock(id="tool-123", name="search", input={"query": "test"})
-        assert block.type == "tool_use"
-        assert block.id == "tool-123"
-        assert block.name == "search"
-        assert block.input == {"query": "test"}
-
-    def test_tool_use_block_defaults(self):
-        """Test ToolUseBlock with defaults."""
-        block = ToolUseBlock()
-        assert block.type == "tool_use"
-        assert block.id == ""
-        assert block.name == ""
-        assert block.input == {}
-
-    def test_tool_result_block(self):
-        """Test ToolResultBlock creation."""
-        block = ToolResultBlock(tool_use_id="tool-123", content=[TextBlock(text="Result")], is_error=False)
-        assert block.type == "tool_result"
-        assert block.tool_use_id == "tool-123"
-        assert len(block.content) == 1
-        assert block.content[0].text == "Result"
-        assert block.is_error is False
-
-    def test_tool_result_block_defaults(self):
-        """Test ToolResultBlock with defaults."""
-        block = ToolResultBlock()
-        assert block.type == "tool_result"
-        assert block.tool_use_id == ""
-        assert block.content == []
-        assert block.is_error is False
+    @pytest.mark.parametrize(
+        ("cls", "kwargs", "expected"),
+        [
+            (TextBlock, {"text": "Hello world"}, {"type": "text", "text": "Hello world"}),
+            (TextBlock, {}, {"type": "text", "text": ""}),
+            (
+                ToolUseBlock,
+                {"id": "tool-123", "name": "search", "input": {"query": "test"}},
+                {"type": "tool_use", "id": "tool-123", "name": "search", "input": {"query": "test"}},
+            ),
+            (ToolUseBlock, {}, {"type": "tool_use", "id": "", "name": "", "input": {}}),
+            (
+                ToolResultBlock,
+                {"tool_use_id": "tool-123", "content": [TextBlock(text="Result")], "is_error": False},
+                {
+                    "type": "tool_result",
+                    "tool_use_id": "tool-123",
+                    "content": [TextBlock(text="Result")],
+                    "is_error": False,
+                },
+            ),
+            (ToolResultBlock, {}, {"type": "tool_result", "tool_use_id": "", "content": [], "is_error": False}),
+        ],
+    )
+    def test_block_construction(self, cls, kwargs, expected):
+        """Test block creation with explicit values and with defaults."""
+        block = cls(**kwargs)
+        for attr, value in expected.items():
+            assert getattr(block, attr) == value
 
 
 class TestClaifOptions:
     """Test ClaifOptions model."""
 
-    def test_default_options(self):
-        """Test creating options with defaults."""
-        options = ClaifOptions()
-        assert options.provider is None
-        assert options.model is None
-        assert options.temperature is None
-        assert options.max_tokens is None
-        assert options.system_prompt is None
-        assert options.timeout is None
-        assert options.verbose is False
-        assert options.output_format == "text"
-        assert options.config_file is None
-        assert options.session_id is None
-        assert options.cache is False
-        assert options.retry_count == 3
-        assert options.retry_delay == 1.0
-
-    def test_options_with_values(self):
-        """Test options with custom values."""
-        options = ClaifOptions(
-            provider=Provider.CLAUDE,
-            model="claude-3-opus",
-            temperature=0.5,
-            max_tokens=1000,
-            system_prompt="You are helpful",
-            timeout=30,
-            verbose=True,
-            output_format="json",
-            session_id="session-123",
-            cache=True,
-            retry_count=5,
-            retry_delay=2.0,
-        )
-        assert options.provider == Provider.CLAUDE
-        assert options.model == "claude-3-opus"
-        assert options.temperature == 0.5
-        assert options.max_tokens == 1000
-        assert options.system_prompt == "You are helpful"
-        assert options.timeout == 30
-        assert options.verbose is True
-        assert options.output_format == "json"
-        assert options.session_id == "session-123"
-        assert options.cache is True
-        assert options.retry_count == 5
-        assert options.retry_delay == 2.0
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            (
+                {},
+                {
+                    "provider": None,
+                    "model": None,
+                    "temperature": None,
+                    "max_tokens": None,
+                    "system_prompt": None,
+                    "timeout": None,
+                    "verbose": False,
+                    "output_format": "text",
+                    "config_file": None,
+                    "session_id": None,
+                    "cache": False,
+                    "retry_count": 3,
+                    "retry_delay": 1.0,
+                },
+            ),
+            (
+                {
+                    "provider": Provider.CLAUDE,
+                    "model": "claude-3-opus",
+                    "temperature": 0.5,
+                    "max_tokens": 1000,
+                    "system_prompt": "You are helpful",
+                    "timeout": 30,
+                    "verbose": True,
+                    "output_format": "json",
+                    "session_id": "session-123",
+                    "cache": True,
+                    "retry_count": 5,
+                    "retry_delay": 2.0,
+                },
+                {
+                    "provider": Provider.CLAUDE,
+                    "model": "claude-3-opus",
+                    "temperature": 0.5,
+                    "max_tokens": 1000,
+                    "system_prompt": "You are helpful",
+                    "timeout": 30,
+                    "verbose": True,
+                    "output_format": "json",
+                    "session_id": "session-123",
+                    "cache": True,
+                    "retry_count": 5,
+                    "retry_delay": 2.0,
+                },
+            ),
+        ],
+    )
+    def test_options(self, kwargs, expected):
+        """Test options with defaults and with custom values."""
+        options = ClaifOptions(**kwargs)
+        for attr, value in expected.items():
+            assert getattr(options, attr) == value
 
 
 class TestProvider:
     """Test Provider enum."""
 
-    def test_provider_values(self):
+    @pytest.mark.parametrize(
+        ("provider", "value"),
+        [(Provider.CLAUDE, "claude"), (Provider.GEMINI, "gemini"), (Provider.CODEX, "codex")],
+    )
+    def test_provider_values(self, provider, value):
         """Test provider enum values."""
-        assert Provider.CLAUDE.value == "claude"
-        assert Provider.GEMINI.value == "gemini"
-        assert Provider.CODEX.value == "codex"
+        assert provider.value == value
 
     def test_provider_comparison(self):
         """Test provider comparisons."""
@@ -163,27 +163,45 @@ class TestProvider:
 class TestResponseMetrics:
     """Test ResponseMetrics model."""
 
-    def test_default_metrics(self):
-        """Test metrics with defaults."""
-        metrics = ResponseMetrics()
-        assert metrics.duration == 0.0
-        assert metrics.tokens_used == 0
-        assert metrics.cost == 0.0
-        assert metrics.provider is None
-        assert metrics.model is None
-        assert metrics.cached is False
-
-    def test_metrics_with_values(self):
-        """Test metrics with custom values."""
-        metrics = ResponseMetrics(
-            duration=1.5, tokens_used=150, cost=0.0075, provider=Provider.GEMINI, model="gemini-pro", cached=True
-        )
-        assert metrics.duration == 1.5
-        assert metrics.tokens_used == 150
-        assert metrics.cost == 0.0075
-        assert metrics.provider == Provider.GEMINI
-        assert metrics.model == "gemini-pro"
-        assert metrics.cached is True
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            (
+                {},
+                {
+                    "duration": 0.0,
+                    "tokens_used": 0,
+                    "cost": 0.0,
+                    "provider": None,
+                    "model": None,
+                    "cached": False,
+                },
+            ),
+            (
+                {
+                    "duration": 1.5,
+                    "tokens_used": 150,
+                    "cost": 0.0075,
+                    "provider": Provider.GEMINI,
+                    "model": "gemini-pro",
+                    "cached": True,
+                },
+                {
+                    "duration": 1.5,
+                    "tokens_used": 150,
+                    "cost": 0.0075,
+                    "provider": Provider.GEMINI,
+                    "model": "gemini-pro",
+                    "cached": True,
+                },
+            ),
+        ],
+    )
+    def test_metrics(self, kwargs, expected):
+        """Test metrics with defaults and with custom values."""
+        metrics = ResponseMetrics(**kwargs)
+        for attr, value in expected.items():
+            assert getattr(metrics, attr) == value
 
 
 class TestClaifResponse:
@@ -1,12 +1,13 @@
 """Tests for claif.common.utils module."""
 
+import copy
 import json
-import os
+import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-from rich.progress import Progress
 
 from claif.common.types import Message, MessageRole, Provider, ResponseMetrics, TextBlock
 from claif.common.utils import (
@@ -28,39 +29,93 @@ from claif.common.utils import (
     truncate_text,
 )
 
+# Checked at import so a constant drift fails fast, once per worker,
+# instead of paying a collected test for one comparison.
+assert APP_NAME == "com.twardoch.claif"
+
+
+# Messages are only read by the formatting tests, so build each shape
+# once per module instead of per test.
+@pytest.fixture(scope="module")
+def assistant_hello():
+    return Message(role=MessageRole.ASSISTANT, content="Hello world")
+
+
+@pytest.fixture(scope="module")
+def user_msg_json():
+    """Parse the JSON rendering of a user message once per module."""
+    msg = Message(role=MessageRole.USER, content="Test message")
+    return json.loads(format_response(msg, format="json"))
+
+
+@pytest.fixture(scope="module")
+def two_block_msg():
+    return Message(role=MessageRole.ASSISTANT, content=[TextBlock(text="First line"), TextBlock(text="Second line")])
+
+
+# Building a specced MagicMock walks the spec'd class once; the templates
+# below pay that cost once per module and each test gets an independent
+# copy.copy (call records are per-copy).
+@pytest.fixture(scope="module")
+def _popen_template():
+    return MagicMock(spec=subprocess.Popen)
+
+
+@pytest.fixture
+def popen_mock(_popen_template, monkeypatch):
+    mock = copy.copy(_popen_template)
+    # The copy shares the template's call-record containers; reset so
+    # each test starts with a clean history.
+    mock.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("subprocess.Popen", mock)
+    return mock
+
+
+class _FakeCapture:
+    """Plain stand-in for rich's Console.capture context manager."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get(self):
+        return "Rendered markdown"
+
+
+class _FakeConsole:
+    """Plain stand-in for rich.Console; attribute access stays cheap."""
+
+    def capture(self):
+        return _FakeCapture()
+
+    def print(self, *args, **kwargs):
+        pass
+
 
 class TestFormatResponse:
     """Test format_response function."""
 
-    def test_format_response_text(self):
+    def test_format_response_text(self, assistant_hello):
         """Test formatting response as text."""
-        msg = Message(role=MessageRole.ASSISTANT, content="Hello world")
-        result = format_response(msg, format="text")
+        result = format_response(assistant_hello, format="text")
         assert result == "Hello world"
 
-    def test_format_response_json(self):
+    def test_format_response_json(self, user_msg_json):
         """Test formatting response as JSON."""
-        msg = Message(role=MessageRole.USER, content="Test message")
-        result = format_response(msg, format="json")
-        data = json.loads(result)
-        assert data["role"] == "user"
-        assert "Test message" in str(data["content"])
+        assert user_msg_json["role"] == "user"
+        assert "Test message" in str(user_msg_json["content"])
 
-    def test_format_response_with_blocks(self):
+    def test_format_response_with_blocks(self, two_block_msg):
         """Test formatting response with content blocks."""
-        msg = Message(role=MessageRole.ASSISTANT, content=[TextBlock(text="First line"), TextBlock(text="Second line")])
-        result = format_response(msg, format="text")
+        result = format_response(two_block_msg, format="text")
         assert "First line" in result
         assert "Second line" in result
 
-    @patch("claif.common.utils.Console")
-    def test_format_response_markdown(self, mock_console_class):
+    def test_format_response_markdown(self, monkeypatch):
         """Test formatting response as markdown."""
-        mock_console = MagicMock()
-        mock_capture = MagicMock()
-        mock_capture.get.return_value = "Rendered markdown"
-        mock_console.capture.return_value.__enter__.return_value = mock_capture
-        mock_console_class.return_value = mock_console
+        monkeypatch.setattr("claif.common.utils.Console", lambda *args, **kwargs: _FakeConsole())
 
         msg = Message(role=MessageRole.ASSISTANT, content="# Heading\nText")
         result = format_response(msg, format="markdown")
@@ -74,20 +129,12 @@ class TestMessageToDict:
     def test_message_to_dict_string_content(self):
         """Test converting message with string content."""
         msg = Message(role=MessageRole.USER, content="Hello")
-        result = message_to_dict(msg)
-
-        assert result["role"] == "user"
-        assert isinstance(result["content"], list)
+        assert message_to_dict(msg) == {"role": "user", "content": [{"type": "text", "text": "Hello"}]}
 
     def test_message_to_dict_block_content(self):
         """Test converting message with block content."""
         msg = Message(role=MessageRole.ASSISTANT, content=[TextBlock(text="Response")])
-        result = message_to_dict(msg)
-
-        assert result["role"] == "assistant"
-        assert len(result["content"]) == 1
-        assert result["content"][0]["type"] == "text"
-        assert result["content"][0]["text"] == "Response"
+        assert message_to_dict(msg) == {"role": "assistant", "content": [{"type": "text", "text": "Response"}]}
 
 
 class TestBlockToDict:
@@ -103,8 +150,7 @@ class TestBlockToDict:
 
     def test_block_to_dict_unknown(self):
         """Test converting unknown block type."""
-        block = MagicMock()
-        block.__dict__ = {"type": "custom", "data": "test"}
+        block = SimpleNamespace(type="custom", data="test")
         result = block_to_dict(block)
 
         assert result == {"type": "custom", "data": "test"}
@@ -137,192 +183,195 @@ class TestFormatMetrics:
 class TestDirectoryFunctions:
     """Test directory utility functions."""
 
-    def test_ensure_directory(self, tmp_path):
+    def test_ensure_directory(self, fs):
         """Test ensuring directory exists."""
-        new_dir = tmp_path / "new" / "nested" / "dir"
+        new_dir = Path("/virtual/new/nested/dir")
 
         ensure_directory(new_dir)
 
         assert new_dir.exists()
         assert new_dir.is_dir()
 
-    def test_ensure_directory_existing(self, tmp_path):
+    def test_ensure_directory_existing(self, fs):
         """Test ensuring existing directory."""
-        existing = tmp_path / "existing"
-        existing.mkdir()
+        existing = Path("/virtual/existing")
+        existing.mkdir(parents=True)
 
         # Should not raise error
         ensure_directory(existing)
 
         assert existing.exists()
 
-    @patch("platformdirs.user_data_dir")
-    def test_get_claif_data_dir(self, mock_data_dir):
+    def test_get_claif_data_dir(self, monkeypatch):
         """Test getting claif data directory."""
-        mock_data_dir.return_value = "/home/user/.local/share/claif"
+        called = []
+
+        def fake_user_data_dir(app, author):
+            called.append((app, author))
+            return "/home/user/.local/share/claif"
+
+        monkeypatch.setattr("platformdirs.user_data_dir", fake_user_data_dir)
 
         result = get_claif_data_dir()
 
         assert result == Path("/home/user/.local/share/claif")
-        mock_data_dir.assert_called_once_with(APP_NAME, "claif")
+        assert called == [(APP_NAME, "claif")]
 
-    @patch("claif.common.utils.get_claif_data_dir")
-    def test_get_claif_bin_path(self, mock_data_dir):
+    def test_get_claif_bin_path(self, monkeypatch):
         """Test getting claif bin path."""
-        mock_data_dir.return_value = Path("/home/user/.local/share/claif")
+        monkeypatch.setattr("claif.common.utils.get_claif_data_dir", lambda: Path("/home/user/.local/share/claif"))
 
         result = get_claif_bin_path()
 
         assert result == Path("/home/user/.local/share/claif/bin")
 
 
+@pytest.fixture(scope="class")
+def _win_env():
+    """Set LOCALAPPDATA once per class; setenv swaps one key instead of
+    snapshotting the whole environ per test like patch.dict."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("LOCALAPPDATA", "C:\\Users\\Test\\AppData\\Local")
+        yield
+
+
+@pytest.mark.usefixtures("_win_env")
 class TestInstallLocation:
     """Test install location functions."""
 
-    @patch("os.name", "nt")
-    @patch.dict(os.environ, {"LOCALAPPDATA": "C:\\Users\\Test\\AppData\\Local"})
-    def test_get_install_location_windows(self):
+    def test_get_install_location_windows(self, monkeypatch):
         """Test getting install location on Windows."""
+        monkeypatch.setattr("sys.platform", "win32")
+
         result = get_install_location()
-        assert result == Path("C:\\Users\\Test\\AppData\\Local\\claif\\bin")
+        assert result == Path("C:\\Users\\Test\\AppData\\Local") / "claif" / "bin"
 
-    @patch("os.name", "posix")
-    @patch("pathlib.Path.home")
-    def test_get_install_location_unix(self, mock_home):
+    def test_get_install_location_unix(self, monkeypatch):
         """Test getting install location on Unix."""
-        mock_home.return_value = Path("/home/user")
+        monkeypatch.setattr("sys.platform", "linux")
+        monkeypatch.setattr("pathlib.Path.home", classmethod(lambda cls: Path("/home/user")))
 
         result = get_install_location()
         assert result == Path("/home/user/.local/bin/claif")
 
-    @patch("claif.common.utils.get_install_location")
-    def test_inject_claif_bin_to_path(self, mock_install_loc):
+    def test_inject_claif_bin_to_path(self, monkeypatch):
         """Test injecting claif bin to PATH."""
-        mock_install_loc.return_value = Path("/home/user/.local/bin/claif")
+        monkeypatch.setattr("claif.common.utils.get_install_location", lambda: Path("/home/user/.local/bin/claif"))
+        monkeypatch.setenv("PATH", "/usr/bin:/bin")
 
-        with patch.dict(os.environ, {"PATH": "/usr/bin:/bin"}):
-            env = inject_claif_bin_to_path()
+        env = inject_claif_bin_to_path()
 
-            assert "/home/user/.local/bin/claif" in env["PATH"]
-            assert env["PATH"].startswith("/home/user/.local/bin/claif")
+        assert "/home/user/.local/bin/claif" in env["PATH"]
+        assert env["PATH"].startswith("/home/user/.local/bin/claif")
 
 
 class TestTextUtilities:
     """Test text utility functions."""
 
-    def test_timestamp(self):
+    def test_timestamp(self, monkeypatch):
         """Test timestamp generation."""
-        with patch("time.strftime", return_value="20231225_120000"):
-            result = timestamp()
-            assert result == "20231225_120000"
-
-    def test_truncate_text_short(self):
-        """Test truncating short text."""
-        text = "Short text"
-        result = truncate_text(text, max_length=20)
-        assert result == "Short text"
-
-    def test_truncate_text_long(self):
-        """Test truncating long text."""
-        text = "This is a very long text that needs to be truncated"
-        result = truncate_text(text, max_length=20)
-        assert result == "This is a very lo..."
-        assert len(result) == 20
-
-    def test_truncate_text_custom_suffix(self):
-        """Test truncating with custom suffix."""
-        text = "Long text here"
-        result = truncate_text(text, max_length=10, suffix="…")
-        assert result == "Long text…"
+        monkeypatch.setattr("time.strftime", lambda *args, **kwargs: "20231225_120000")
+        assert timestamp() == "20231225_120000"
+
+    @pytest.mark.parametrize(
+        ("text", "max_length", "suffix", "expected"),
+        [
+            ("Short text", 20, "...", "Short text"),
+            ("This is a very long text that needs to be truncated", 20, "...", "This is a very lo..."),
+            ("Long text here", 10, "…", "Long text…"),
+        ],
+    )
+    def test_truncate_text(self, text, max_length, suffix, expected):
+        """Test truncation for short, long and custom-suffix inputs."""
+        result = truncate_text(text, max_length=max_length, suffix=suffix)
+        assert result == expected
+        assert len(result) <= max_length
 
 
 class TestParseContentBlocks:
     """Test parse_content_blocks function."""
 
-    def test_parse_string_content(self):
-        """Test parsing string content."""
-        blocks = parse_content_blocks("Hello world")
-
-        assert len(blocks) == 1
-        assert isinstance(blocks[0], TextBlock)
-        assert blocks[0].text == "Hello world"
-
-    def test_parse_list_content(self):
-        """Test parsing list content."""
-        content = [TextBlock(text="First"), {"type": "text", "text": "Second"}, "Third"]
+    @pytest.mark.parametrize(
+        ("content", "expected_texts"),
+        [
+            ("Hello world", ["Hello world"]),
+            ([TextBlock(text="First"), {"type": "text", "text": "Second"}, "Third"], ["First", "Second", "Third"]),
+            (123, ["123"]),
+        ],
+    )
+    def test_parse_content_blocks(self, content, expected_texts):
+        """Test normalizing string, mixed-list and scalar content."""
         blocks = parse_content_blocks(content)
 
-        assert len(blocks) == 3
         assert all(isinstance(b, TextBlock) for b in blocks)
-        assert blocks[0].text == "First"
-        assert blocks[1].text == "Second"
-        assert blocks[2].text == "Third"
+        assert [b.text for b in blocks] == expected_texts
 
-    def test_parse_other_content(self):
-        """Test parsing other content types."""
-        blocks = parse_content_blocks(123)
 
-        assert len(blocks) == 1
-        assert blocks[0].text == "123"
+@pytest.fixture(scope="module")
+def progress_bar():
+    """Build the rich progress bar once per module; tests only read it."""
+    return create_progress_bar("Testing...")
 
 
 class TestProgressBar:
     """Test progress bar creation."""
 
-    def test_create_progress_bar(self):
+    def test_create_progress_bar(self, progress_bar):
         """Test creating progress bar."""
-        progress = create_progress_bar("Testing...")
+        # Deferred: rich.progress is heavy and only this test needs the
+        # class for its isinstance check.
+        from rich.progress import Progress
 
-        assert isinstance(progress, Progress)
+        assert isinstance(progress_bar, Progress)
         # Progress has columns
-        assert len(progress.columns) > 0
+        assert len(progress_bar.columns) > 0
 
 
 class TestTerminalCommands:
     """Test terminal command functions."""
 
-    @patch("platform.system", return_value="Darwin")
-    @patch("subprocess.Popen")
-    def test_open_commands_darwin(self, mock_popen, mock_system):
-        """Test opening commands on macOS."""
-        commands = ["echo test1", "echo test2"]
+    @pytest.mark.parametrize(
+        ("system", "expected_substr", "n_commands"),
+        [
+            ("Darwin", "osascript", 2),
+            ("Windows", "cmd", 1),
+            ("Linux", None, 1),
+        ],
+    )
+    def test_open_commands(self, popen_mock, monkeypatch, system, expected_substr, n_commands):
+        """Test opening commands launches one terminal per command."""
+        monkeypatch.setattr("platform.system", lambda: system)
+        commands = [f"echo test{i}" for i in range(n_commands)]
 
         open_commands_in_terminals(commands)
 
-        assert mock_popen.call_count == 2
-        # Check osascript was called
-        calls = mock_popen.call_args_list
-        for call in calls:
-            assert "osascript" in call[0][0]
+        assert popen_mock.call_count == n_commands
+        if expected_substr is not None:
+            for call in popen_mock.call_args_list:
+                assert expected_substr in call[0][0]
 
-    @patch("platform.system", return_value="Windows")
-    @patch("subprocess.Popen")
-    def test_open_commands_windows(self, mock_popen, mock_system):
-        """Test opening commands on Windows."""
-        commands = ["echo test"]
+    def test_open_commands_linux_fallback(self, monkeypatch):
+        """Test Linux falls through missing terminal emulators."""
+        monkeypatch.setattr("platform.system", lambda: "Linux")
+        attempted = []
 
-        open_commands_in_terminals(commands)
+        def fake_popen(argv, *args, **kwargs):
+            attempted.append(argv[0])
+            # First emulator is missing, second exists
+            if len(attempted) == 1:
+                raise FileNotFoundError
+            return object()
 
-        mock_popen.assert_called_once()
-        call_args = mock_popen.call_args[0][0]
-        assert "cmd" in call_args
+        monkeypatch.setattr("subprocess.Popen", fake_popen)
 
-    @patch("platform.system", return_value="Linux")
-    @patch("subprocess.Popen")
-    def test_open_commands_linux(self, mock_popen, mock_system):
-        """Test opening commands on Linux."""
-        commands = ["echo test"]
+        open_commands_in_terminals(["echo test"])
 
-        # First terminal exists
-        mock_popen.side_effect = [MagicMock(), FileNotFoundError()]
+        assert len(attempted) == 2
+        assert attempted[0] != attempted[1]
 
-        open_commands_in_terminals(commands)
-
-        assert mock_popen.call_count >= 1
-
-    @patch("platform.system", return_value="Unknown")
-    def test_open_commands_unsupported(self, mock_system):
+    def test_open_commands_unsupported(self, monkeypatch):
         """Test opening commands on unsupported OS."""
+        monkeypatch.setattr("platform.system", lambda: "Unknown")
         with pytest.raises(NotImplementedError):
             open_commands_in_terminals(["echo test"])
 
@@ -330,43 +379,40 @@ class TestTerminalCommands:
 class TestPromptToolConfiguration:
     """Test prompt_tool_configuration function."""
 
-    @patch("builtins.input", return_value="y")
-    @patch("claif.common.utils.open_commands_in_terminals")
-    def test_prompt_accept(self, mock_open_terminals, mock_input):
+    @pytest.fixture
+    def opened_commands(self, monkeypatch):
+        """Record command lists passed to open_commands_in_terminals."""
+        opened = []
+        monkeypatch.setattr("claif.common.utils.open_commands_in_terminals", opened.append)
+        return opened
+
+    def test_prompt_accept(self, opened_commands, monkeypatch):
         """Test accepting prompt to open terminals."""
+        monkeypatch.setattr("builtins.input", lambda *args: "y")
         commands = ["configure --api-key"]
 
         prompt_tool_configuration("Test Tool", commands)
 
-        mock_input.assert_called_once()
-        mock_open_terminals.assert_called_once_with(commands)
+        assert opened_commands == [commands]
 
-    @patch("builtins.input", return_value="n")
-    @patch("claif.common.utils.open_commands_in_terminals")
-    def test_prompt_decline(self, mock_open_terminals, mock_input):
+    def test_prompt_decline(self, opened_commands, monkeypatch):
         """Test declining prompt."""
+        monkeypatch.setattr("builtins.input", lambda *args: "n")
         commands = ["configure --api-key"]
 
         prompt_tool_configuration("Test Tool", commands)
 
-        mock_input.assert_called_once()
-        mock_open_terminals.assert_not_called()
+        assert opened_commands == []
 
-    @patch("builtins.input", side_effect=KeyboardInterrupt)
-    @patch("claif.common.utils.open_commands_in_terminals")
-    def test_prompt_interrupt(self, mock_open_terminals, mock_input):
+    def test_prompt_interrupt(self, opened_commands, monkeypatch):
         """Test interrupting prompt."""
-        commands = ["configure --api-key"]
 
-        # Should not raise
-        prompt_tool_configuration("Test Tool", commands)
+        def raise_interrupt(*args):
+            raise KeyboardInterrupt
 
-        mock_open_terminals.assert_not_called()
+        monkeypatch.setattr("builtins.input", raise_interrupt)
 
+        # Should not raise
+        prompt_tool_configuration("Test Tool", ["configure --api-key"])
 
-class TestConstants:
-    """Test module constants."""
-
-    def test_app_name(self):
-        """Test APP_NAME constant."""
-        assert APP_NAME == "com.twardoch.claif"
+        assert opened_commands == []